@@ -0,0 +1,57 @@
+"""
+Measures the event cleaner on an outbox holding lots of sent events, with and
+without the index on sent events.
+
+    python -m benchmarks.event_cleaner --sent-events 2000000
+
+Events are sent over the last --days days, so with the default TIME_TO_DELETE
+of 7 days the cleaner deletes events sent in the oldest day. It runs against a
+throwaway test database of DJANGO_SETTINGS_MODULE (the test project by default).
+"""
+
+import argparse
+
+from benchmarks.utils import measure, populate_events, setup_django, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sent-events", type=int, default=2_000_000)
+    parser.add_argument("--unsent-events", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=8)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from jaiminho import settings
+    from jaiminho.models import Event
+
+    sent_at_index = next(
+        index
+        for index in Event._meta.indexes
+        if index.name == "jaiminho_event_sent_at_idx"
+    )
+    cleaner_qs = Event.objects.filter(
+        sent_at__isnull=False, sent_at__lt=timezone.now() - settings.time_to_delete
+    )
+
+    with test_database() as connection:
+        for with_index in (True, False):
+            Event.objects.all()._raw_delete(Event.objects.db)
+            populate_events(args.sent_events, args.unsent_events, days=args.days)
+            if not with_index:
+                with connection.schema_editor() as schema_editor:
+                    schema_editor.remove_index(Event, sent_at_index)
+
+            expired_events = cleaner_qs.count()
+            print(f"{'With' if with_index else 'Without'} {sent_at_index.name}:")
+            print(cleaner_qs.explain())
+            elapsed = measure(lambda: call_command("event_cleaner"), repeat=1)
+            print(f"Deleted {expired_events} events in {elapsed * 1000:.2f}ms\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Measures acknowledging relayed events one by one, comparing a full save, which
+signs the event again and writes back every column, with Event.mark_as_sent,
+which only updates sent_at. EventQuerySet.mark_as_sent, used by the batch mode,
+is measured as well.
+
+    python -m benchmarks.mark_as_sent --events 2000 --payload-size 16384
+
+Bytes are the size of the SQL statements and their parameters sent to the
+database. It runs against a throwaway test database of DJANGO_SETTINGS_MODULE
+(the test project by default).
+"""
+
+import argparse
+import os
+
+from benchmarks.utils import BATCH_SIZE, measure, setup_django, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--payload-size", type=int, default=16384)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.utils import timezone
+
+    from jaiminho.models import Event
+
+    def full_save(events):
+        for event in events:
+            event.sent_at = timezone.now()
+            event.save()
+
+    def mark_as_sent(events):
+        for event in events:
+            event.mark_as_sent()
+
+    def bulk_mark_as_sent(events):
+        Event.objects.filter(id__in=[event.id for event in events]).mark_as_sent()
+
+    with test_database() as connection:
+        for name, acknowledge in (
+            ("Event.save()", full_save),
+            ("Event.mark_as_sent()", mark_as_sent),
+            ("EventQuerySet.mark_as_sent()", bulk_mark_as_sent),
+        ):
+            Event.objects.all()._raw_delete(Event.objects.db)
+            Event.objects.bulk_create(
+                (
+                    Event(
+                        message=os.urandom(args.payload_size),
+                        function=os.urandom(1024),
+                    )
+                    for _ in range(args.events)
+                ),
+                batch_size=BATCH_SIZE,
+            )
+            events = list(Event.objects.all())
+
+            sent_bytes = 0
+
+            def count_bytes(execute, sql, params, many, context):
+                nonlocal sent_bytes
+                sent_bytes += len(sql) + sum(
+                    len(param)
+                    for param in params or ()
+                    if isinstance(param, (bytes, str, memoryview))
+                )
+                return execute(sql, params, many, context)
+
+            with connection.execute_wrapper(count_bytes):
+                elapsed = measure(lambda: acknowledge(events), repeat=1)
+
+            print(f"{name}:")
+            print(
+                f"{elapsed * 1_000_000 / args.events:.2f}us and "
+                f"{sent_bytes / args.events:.0f} bytes per event\n"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Measures the relay query on an outbox holding lots of sent events, with and
+without the index on pending (unsent and not dead) events.
+
+    python -m benchmarks.relay_query --sent-events 1000000 --unsent-events 1000
+
+It runs against a throwaway test database of DJANGO_SETTINGS_MODULE (the test
+project by default), so point it to a PostgreSQL or MySQL database to see the
+query plan of your backend.
+"""
+
+import argparse
+
+from benchmarks.utils import measure, populate_events, setup_django, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sent-events", type=int, default=1_000_000)
+    parser.add_argument("--unsent-events", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from jaiminho.models import Event
+
+    pending_index = next(
+        index
+        for index in Event._meta.indexes
+        if index.name == "jaiminho_event_pending_idx"
+    )
+
+    with test_database() as connection:
+        populate_events(args.sent_events, args.unsent_events)
+        relay_qs = Event.objects.filter(
+            sent_at__isnull=True, dead_at__isnull=True, stream=None
+        ).order_by("created_at", "id")[: args.batch_size]
+
+        def run_relay_query():
+            return list(relay_qs.all())
+
+        print(f"With {pending_index.name}:")
+        print(relay_qs.explain())
+        print(f"{measure(run_relay_query, args.repeat) * 1000:.2f}ms\n")
+
+        with connection.schema_editor() as schema_editor:
+            schema_editor.remove_index(Event, pending_index)
+
+        print(f"Without {pending_index.name}:")
+        print(relay_qs.explain())
+        print(f"{measure(run_relay_query, args.repeat) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
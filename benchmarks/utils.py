@@ -0,0 +1,68 @@
+import os
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+import django
+
+BATCH_SIZE = 5000
+
+
+def setup_django():
+    os.environ.setdefault(
+        "DJANGO_SETTINGS_MODULE", "jaiminho_django_test_project.settings"
+    )
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def populate_events(sent_events, unsent_events, stream=None, days=30):
+    from django.db.models import F
+    from django.utils import timezone
+
+    from jaiminho.models import Event
+
+    now = timezone.now()
+    total = sent_events + unsent_events
+    step = timedelta(days=days) / max(total, 1)
+    message = (
+        b"\x80\x04\x95\x0c\x00\x00\x00\x00\x00\x00\x00}\x94\x8c\x01a\x94K\x01s\x85\x94."
+    )
+
+    # Sent events are the oldest ones, like in an outbox that keeps sent events
+    for start in range(0, total, BATCH_SIZE):
+        Event.objects.bulk_create(
+            Event(
+                message=message,
+                stream=stream,
+                sent_at=(
+                    now - timedelta(days=days) + step * position
+                    if position < sent_events
+                    else None
+                ),
+            )
+            for position in range(start, min(start + BATCH_SIZE, total))
+        )
+
+    # created_at is always set to the current time on creation
+    Event.objects.filter(sent_at__isnull=False).update(created_at=F("sent_at"))
+
+
+def measure(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from jaiminho.models import Event
+from jaiminho.models import Event, EventArchive
 
 
 class EventAdmin(admin.ModelAdmin):
@@ -23,3 +23,4 @@ class EventAdmin(admin.ModelAdmin):
 
 
 admin.site.register(Event, EventAdmin)
+admin.site.register(EventArchive, EventAdmin)
@@ -0,0 +1,190 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from django.utils import timezone
+
+from jaiminho.coroutines import acall_publisher
+from jaiminho.models import Event
+from jaiminho.relayer import (
+    EventRelayer,
+    _capture_exception,
+    _due_events_q,
+    _ordered_events_q,
+    default_worker_id,
+)
+from jaiminho.signals import (
+    event_published_by_events_relay,
+    event_failed_to_publish_by_events_relay,
+)
+from jaiminho import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 100
+DEFAULT_LEASE_DURATION = 60
+
+
+class AsyncEventRelayer(EventRelayer):
+    def __init__(self, function_cache_size=None, max_in_flight=None):
+        super().__init__(function_cache_size)
+        self.max_in_flight = max_in_flight or DEFAULT_MAX_IN_FLIGHT
+
+    async def relay(
+        self,
+        stream=None,
+        batch_size=None,
+        max_events=None,
+        lease_duration=None,
+        worker_id=None,
+        max_in_flight=None,
+        events_per_second=None,
+        bytes_per_second=None,
+    ):
+        # Events are claimed through leases, so several relays can run concurrently.
+        # Only events that do not need to keep order are relayed.
+        max_in_flight = max_in_flight or self.max_in_flight
+        in_flight = asyncio.Semaphore(max_in_flight)
+        events_count = 0
+        sent_count = 0
+        self._configure_rate_limiter(stream, events_per_second, bytes_per_second)
+
+        async for events in self._aclaim_events(
+            stream,
+            batch_size or max_in_flight,
+            max_events,
+            lease_duration or DEFAULT_LEASE_DURATION,
+            worker_id or default_worker_id(),
+        ):
+            events_count += len(events)
+            results = await asyncio.gather(
+                *(self._arelay_event_in_flight(event, in_flight) for event in events)
+            )
+            sent_events = [event for event, sent in zip(events, results) if sent]
+            sent_count += len(sent_events)
+            if sent_events:
+                await self._aacknowledge_events(sent_events)
+            # Events skipped while the circuit of their function is open, or after their
+            # lease expired, aren't failures
+            failed_events = [
+                event for event, sent in zip(events, results) if sent is False
+            ]
+            if failed_events:
+                await sync_to_async(self._record_failures)(failed_events)
+
+        if not events_count:
+            logger.info("No failed events found.")
+        else:
+            logger.info(f"JAIMINHO-EVENTS-RELAY: Relay stats: {self.stats()}")
+
+        return sent_count
+
+    async def _aclaim_events(
+        self, stream, batch_size, max_events, lease_duration, worker_id
+    ):
+        events_qs = Event.objects.filter(
+            sent_at__isnull=True, dead_at__isnull=True, stream=stream
+        )
+        events_qs = events_qs.exclude(_ordered_events_q())
+
+        remaining = max_events
+        while remaining is None or remaining > 0:
+            page_size = batch_size if remaining is None else min(batch_size, remaining)
+
+            now = timezone.now()
+            lease_expires_at = now + timedelta(seconds=lease_duration)
+            claimable_q = Q(lease_expires_at__isnull=True) | Q(
+                lease_expires_at__lte=now
+            )
+            candidate_ids = [
+                event_id
+                async for event_id in events_qs.filter(claimable_q)
+                .filter(_due_events_q(now))
+                .order_by("created_at", "id")
+                .values_list("id", flat=True)[:page_size]
+            ]
+            if not candidate_ids:
+                return
+
+            # The UPDATE checks the lease again, so events claimed in the meantime
+            # by concurrent relays are skipped
+            claimed_count = await Event.objects.filter(
+                claimable_q, id__in=candidate_ids
+            ).aupdate(claimed_by=worker_id, lease_expires_at=lease_expires_at)
+            if claimed_count:
+                logger.info(
+                    f"JAIMINHO-EVENTS-RELAY: {claimed_count} events claimed by {worker_id}"
+                )
+                yield [
+                    event
+                    async for event in Event.objects.filter(
+                        id__in=candidate_ids,
+                        claimed_by=worker_id,
+                        lease_expires_at=lease_expires_at,
+                    ).order_by("created_at", "id")
+                ]
+
+            if len(candidate_ids) < page_size:
+                return
+
+            if remaining is not None:
+                remaining -= len(candidate_ids)
+
+    async def _arelay_event_in_flight(self, event, in_flight):
+        async with in_flight:
+            return await self._arelay_event(event)
+
+    async def _arelay_event(self, event):
+        circuit_breaker = self._circuit_breaker(event)
+        if circuit_breaker and not circuit_breaker.allow():
+            return None
+
+        rate_limit_delay = self._reserve_rate_limit(event)
+        if rate_limit_delay:
+            await asyncio.sleep(rate_limit_delay)
+
+        if self._lease_expired(event, circuit_breaker):
+            return None
+
+        event_payload = {}
+
+        try:
+            original_fn, args, kwargs, event_payload = self._load_event(event)
+            await acall_publisher(original_fn, args, kwargs)
+            logger.info(f"JAIMINHO-EVENTS-RELAY: Event sent. Event {event}")
+        except Exception as e:
+            self._record_failure(event, e)
+            publisher_failed = self._handle_relay_error(event, e)
+            if publisher_failed:
+                # Signal.asend requires Django 5.0
+                await sync_to_async(event_failed_to_publish_by_events_relay.send)(
+                    sender=self._extract_original_func(event),
+                    event_payload=event_payload,
+                )
+            self._record_circuit_result(event, circuit_breaker, publisher_failed)
+            _capture_exception(e)
+            return False
+
+        if circuit_breaker:
+            circuit_breaker.record_success()
+        await sync_to_async(event_published_by_events_relay.send)(
+            sender=original_fn, event_payload=event_payload
+        )
+        return True
+
+    async def _aacknowledge_events(self, events):
+        events_qs = Event.objects.filter(id__in=[event.id for event in events])
+
+        if settings.delete_after_send:
+            await events_qs.adelete()
+            logger.info(
+                f"JAIMINHO-EVENTS-RELAY: {len(events)} events deleted after success send."
+            )
+        elif settings.archive_sent_events:
+            await events_qs.aarchive()
+            logger.info(f"JAIMINHO-EVENTS-RELAY: {len(events)} events archived.")
+        else:
+            await events_qs.amark_as_sent()
+            logger.info(f"JAIMINHO-EVENTS-RELAY: {len(events)} events marked as sent.")
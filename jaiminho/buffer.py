@@ -0,0 +1,88 @@
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.db import connections, transaction
+
+from jaiminho.models import Event
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class SavepointMarker:
+    # No-op on commit hook registered in the savepoint of buffered events. Django discards
+    # the hooks of rolled back savepoints, so a missing marker means its events were rolled back.
+
+    def __call__(self):
+        pass
+
+
+class OutboxBuffer:
+    def __init__(self, using):
+        self.using = using
+        self.events = []
+        self._markers = {}
+
+    def add(self, event):
+        savepoint_ids = tuple(connections[self.using].savepoint_ids)
+        marker = self._markers.get(savepoint_ids)
+        if marker is None:
+            marker = SavepointMarker()
+            transaction.on_commit(marker, using=self.using)
+            self._markers[savepoint_ids] = marker
+        self.events.append((event, marker))
+
+    def flush(self):
+        if not self.events:
+            return
+
+        registered_markers = {
+            id(hook[1]) for hook in connections[self.using].run_on_commit
+        }
+        events = [
+            event for event, marker in self.events if id(marker) in registered_markers
+        ]
+        discarded = len(self.events) - len(events)
+        self.events = []
+        self._markers = {}
+        if discarded:
+            logger.info(
+                f"JAIMINHO-SAVE-TO-OUTBOX: {discarded} buffered events discarded, "
+                f"their savepoint was rolled back"
+            )
+        if not events:
+            return
+
+        if connections[self.using].features.can_return_rows_from_bulk_insert:
+            Event.objects.using(self.using).bulk_create(events)
+        else:
+            # Publish on commit hooks need the primary key of persisted events
+            for event in events:
+                event.save(using=self.using)
+
+        logger.info(f"JAIMINHO-SAVE-TO-OUTBOX: {len(events)} buffered events created")
+
+
+def get_outbox_buffer():
+    return getattr(_local, "outbox_buffer", None)
+
+
+@contextmanager
+def outbox_buffer(using=None):
+    # Nested buffers join the outermost one, which creates all events
+    if get_outbox_buffer() is not None:
+        yield get_outbox_buffer()
+        return
+
+    using = using or Event.objects.db
+    buffer = OutboxBuffer(using)
+    _local.outbox_buffer = buffer
+    try:
+        with transaction.atomic(using=using):
+            yield buffer
+            _local.outbox_buffer = None
+            buffer.flush()
+    finally:
+        _local.outbox_buffer = None
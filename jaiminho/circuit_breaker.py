@@ -0,0 +1,65 @@
+import threading
+from time import monotonic
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    # Opens after consecutive failures, so calls are rejected without trying them.
+    # After the reset timeout a single trial call is allowed, closing the circuit
+    # again if it succeeds.
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        # Worker threads of a relay share the circuit of each function
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return CLOSED
+        if monotonic() - self.opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        # Returns whether the failure opened the circuit
+        with self._lock:
+            self.failures += 1
+            opened = self._trial_in_flight or (
+                self.opened_at is None and self.failures >= self.failure_threshold
+            )
+            if opened:
+                self.opened_at = monotonic()
+            self._trial_in_flight = False
+            return opened
+
+    def release(self):
+        # The call failed before reaching the protected function, so it tells nothing about it
+        with self._lock:
+            self._trial_in_flight = False
+
+    def stats(self):
+        return {"state": self.state, "failures": self.failures}
@@ -0,0 +1,70 @@
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Serialized payloads never start with a null byte, so it marks compressed
+# payloads, followed by a byte identifying the codec used to compress them
+COMPRESSION_HEADER = b"\x00"
+
+
+class ZlibCodec:
+    name = "zlib"
+    codec_id = b"\x01"
+
+    def compress(self, data):
+        return zlib.compress(data)
+
+    def decompress(self, data):
+        return zlib.decompress(data)
+
+
+class ZstdCodec:
+    name = "zstd"
+    codec_id = b"\x02"
+
+    def __init__(self):
+        if zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package")
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor().compress(data)
+
+    def decompress(self, data):
+        return zstandard.ZstdDecompressor().decompress(data)
+
+
+CODECS = {codec.name: codec for codec in (ZlibCodec, ZstdCodec)}
+CODECS_BY_ID = {codec.codec_id: codec for codec in (ZlibCodec, ZstdCodec)}
+
+
+def get_codec(name):
+    try:
+        return CODECS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown compression codec: {name}")
+
+
+def compress(data, codec_name, threshold=0):
+    if data is None or codec_name is None or len(data) < threshold:
+        return data
+
+    codec = get_codec(codec_name)
+    compressed_data = COMPRESSION_HEADER + codec.codec_id + codec.compress(data)
+    if len(compressed_data) >= len(data):
+        return data
+    return compressed_data
+
+
+def decompress(data):
+    if data is None or bytes(data[:1]) != COMPRESSION_HEADER:
+        return data
+
+    codec_id = bytes(data[1:2])
+    try:
+        codec = CODECS_BY_ID[codec_id]()
+    except KeyError:
+        raise ValueError(f"Unknown compression codec id: {codec_id!r}")
+    return codec.decompress(bytes(data[2:]))
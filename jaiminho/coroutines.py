@@ -0,0 +1,32 @@
+import inspect
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+
+def _call(fn, args, kwargs):
+    if isinstance(args, tuple):
+        return fn(*args, **kwargs)
+    return fn(args, **kwargs)
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+def call_publisher(fn, args, kwargs):
+    # Coroutine publishers are run to completion, so sync callers can rely on them
+    result = _call(fn, args, kwargs)
+    if inspect.isawaitable(result):
+        return async_to_sync(_await)(result)
+    return result
+
+
+async def acall_publisher(fn, args, kwargs):
+    if inspect.iscoroutinefunction(fn):
+        return await _call(fn, args, kwargs)
+
+    # Sync publishers run in worker threads, so they don't block the event loop
+    result = await sync_to_async(_call, thread_sensitive=False)(fn, args, kwargs)
+    if inspect.isawaitable(result):
+        return await result
+    return result
@@ -1,11 +1,14 @@
 import logging
 from datetime import timedelta
+from time import monotonic, sleep
 
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, CommandError
+from django.db import NotSupportedError, transaction
 from django.utils import timezone
 
 from jaiminho import settings
-from jaiminho.models import Event
+from jaiminho.models import Event, EventArchive
+from jaiminho.partitioning import drop_expired_partitions, is_partitioned
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +18,39 @@ class Command(BaseCommand):
         assert isinstance(settings.time_to_delete, timedelta)
         return super().__new__(cls, *args, **kwargs)
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            nargs="?",
+            type=int,
+            default=None,
+            help="Delete events in chunks of the given size, ordered by primary key, each one in its "
+            "own transaction. If not provided, all events are deleted in a single statement.",
+        )
+        parser.add_argument(
+            "--sleep-between-chunks",
+            nargs="?",
+            type=float,
+            default=0,
+            help="Define the sleep interval (in seconds) between each deleted chunk",
+        )
+        parser.add_argument(
+            "--max-runtime",
+            nargs="?",
+            type=float,
+            default=None,
+            help="Stop deleting chunks after the given time (in seconds). "
+            "Remaining events are deleted in the next run.",
+        )
+
+        parser.add_argument(
+            "--drop-partitions",
+            action="store_true",
+            default=False,
+            help="Drop whole partitions whose events were all sent before the deletion threshold "
+            "before deleting the remaining events. Requires a partitioned outbox table (PostgreSQL only).",
+        )
+
     def handle(self, *args, **options):
         deletion_threshold_timestamp = timezone.now() - settings.time_to_delete
 
@@ -24,9 +60,91 @@ class Command(BaseCommand):
 
         logger.info("JAIMINHO-EVENT-CLEANER: Start cleaning up events ..")
 
-        count = events_to_delete._raw_delete(events_to_delete.db)
+        if options.get("drop_partitions"):
+            self._drop_partitions(deletion_threshold_timestamp)
 
+        started_at = monotonic()
+        count = self._delete(events_to_delete, options, started_at)
         logger.info(
             "JAIMINHO-EVENT-CLEANER: Successfully deleted %s events",
             count,
         )
+
+        archived_events_to_delete = EventArchive.objects.filter(
+            sent_at__lt=deletion_threshold_timestamp
+        )
+        count = self._delete(archived_events_to_delete, options, started_at)
+        logger.info(
+            "JAIMINHO-EVENT-CLEANER: Successfully deleted %s archived events",
+            count,
+        )
+
+    def _delete(self, events_to_delete, options, started_at):
+        if options.get("chunk_size"):
+            return self._delete_in_chunks(
+                events_to_delete,
+                options["chunk_size"],
+                options.get("sleep_between_chunks") or 0,
+                options.get("max_runtime"),
+                started_at,
+            )
+        return events_to_delete._raw_delete(events_to_delete.db)
+
+    def _delete_in_chunks(
+        self,
+        events_to_delete,
+        chunk_size,
+        sleep_between_chunks,
+        max_runtime,
+        started_at,
+    ):
+        last_id = None
+        count = 0
+
+        while True:
+            if max_runtime is not None and monotonic() - started_at >= max_runtime:
+                logger.info(
+                    "JAIMINHO-EVENT-CLEANER: Max runtime of %ss reached, stopping",
+                    max_runtime,
+                )
+                break
+
+            chunk = events_to_delete.order_by("id")
+            if last_id is not None:
+                chunk = chunk.filter(id__gt=last_id)
+
+            with transaction.atomic(using=events_to_delete.db):
+                ids = list(chunk.values_list("id", flat=True)[:chunk_size])
+                if not ids:
+                    break
+                chunk_qs = events_to_delete.model.objects.filter(id__in=ids)
+                count += chunk_qs._raw_delete(chunk_qs.db)
+
+            last_id = ids[-1]
+            logger.info(
+                "JAIMINHO-EVENT-CLEANER: Deleted chunk of %s events (%s deleted so far)",
+                len(ids),
+                count,
+            )
+
+            if len(ids) < chunk_size:
+                break
+            if sleep_between_chunks:
+                sleep(sleep_between_chunks)
+
+        return count
+
+    def _drop_partitions(self, deletion_threshold_timestamp):
+        try:
+            if not is_partitioned():
+                raise CommandError(
+                    "The outbox table is not partitioned, run events_partitions --setup first"
+                )
+            dropped = drop_expired_partitions(deletion_threshold_timestamp)
+        except NotSupportedError as e:
+            raise CommandError(str(e))
+
+        logger.info(
+            "JAIMINHO-EVENT-CLEANER: Successfully dropped %s partitions",
+            len(dropped),
+        )
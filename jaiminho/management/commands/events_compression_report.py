@@ -0,0 +1,71 @@
+import logging
+from collections import defaultdict
+
+from django.core.management import BaseCommand
+
+from jaiminho.compression import decompress
+from jaiminho.models import Event
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Report how much the payload of outbox events is compressed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stream",
+            nargs="?",
+            type=str,
+            default=None,
+            help="Define which stream events should be reported. If not provided, all streams are reported.",
+        )
+        parser.add_argument(
+            "--limit",
+            nargs="?",
+            type=int,
+            default=None,
+            help="Define the maximum number of events (the most recent ones) sampled per report",
+        )
+
+    def handle(self, *args, **options):
+        events_qs = Event.objects.all()
+        if options["stream"] is not None:
+            events_qs = events_qs.filter(stream=options["stream"])
+        events_qs = events_qs.order_by("-id")
+        if options["limit"]:
+            events_qs = events_qs[: options["limit"]]
+
+        report = defaultdict(lambda: {"events": 0, "stored": 0, "uncompressed": 0})
+        for stream, message, kwargs in events_qs.values_list(
+            "stream", "message", "kwargs"
+        ).iterator():
+            stream_report = report[stream]
+            stream_report["events"] += 1
+            for payload in (message, kwargs):
+                if payload is None:
+                    continue
+                stream_report["stored"] += len(payload)
+                stream_report["uncompressed"] += len(decompress(payload))
+
+        for stream, stream_report in report.items():
+            ratio = (
+                stream_report["uncompressed"] / stream_report["stored"]
+                if stream_report["stored"]
+                else 1
+            )
+            logger.info(
+                "JAIMINHO-EVENTS-COMPRESSION-REPORT: Stream %s: %s events, %s bytes stored, "
+                "%s bytes uncompressed, compression ratio %.2f",
+                stream,
+                stream_report["events"],
+                stream_report["stored"],
+                stream_report["uncompressed"],
+                ratio,
+            )
+            self.stdout.write(
+                f"stream={stream} events={stream_report['events']} "
+                f"stored_bytes={stream_report['stored']} "
+                f"uncompressed_bytes={stream_report['uncompressed']} "
+                f"ratio={ratio:.2f}"
+            )
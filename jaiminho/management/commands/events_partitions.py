@@ -0,0 +1,66 @@
+import logging
+
+from django.core.management import BaseCommand, CommandError
+from django.db import NotSupportedError
+
+from jaiminho import settings
+from jaiminho.partitioning import (
+    PARTITION_INTERVALS,
+    create_partitions,
+    is_partitioned,
+    setup_partitioning,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Partition the outbox table by creation time and create upcoming partitions (PostgreSQL only)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--setup",
+            action="store_true",
+            default=False,
+            help="Convert the outbox table into a table partitioned by created_at. "
+            "Existing events are copied while the table is locked.",
+        )
+        parser.add_argument(
+            "--interval",
+            nargs="?",
+            type=str,
+            choices=sorted(PARTITION_INTERVALS),
+            default=None,
+            help="Define the time range of each partition. Defaults to the PARTITION_INTERVAL setting.",
+        )
+        parser.add_argument(
+            "--premake",
+            nargs="?",
+            type=int,
+            default=7,
+            help="Define how many upcoming partitions are created ahead of the current one",
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"] or settings.partition_interval
+        premake = options["premake"]
+        if interval not in PARTITION_INTERVALS:
+            raise CommandError(
+                f"Invalid partition interval {interval}, choose one of {sorted(PARTITION_INTERVALS)}"
+            )
+
+        try:
+            if not is_partitioned():
+                if not options["setup"]:
+                    raise CommandError(
+                        "The outbox table is not partitioned, run with --setup to partition it"
+                    )
+                created = setup_partitioning(interval, premake)
+            else:
+                created = create_partitions(interval, premake)
+        except NotSupportedError as e:
+            raise CommandError(str(e))
+
+        logger.info(f"JAIMINHO-PARTITIONING: Created {len(created)} partitions")
+        for name in created:
+            self.stdout.write(name)
@@ -1,14 +1,48 @@
 import logging
 from time import sleep
 
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, CommandError
+from django.db import NotSupportedError
+
+from asgiref.sync import async_to_sync
+
+from jaiminho.async_relayer import AsyncEventRelayer
+from jaiminho.notifications import EventNotificationListener
 from jaiminho.relayer import EventRelayer
+from jaiminho.signals import events_relay_iteration_finished
 
 log = logging.getLogger(__name__)
 
 
+def parse_streams(value):
+    # "stream-a:3,stream-b" relays stream-a with weight 3 and stream-b with weight 1
+    streams = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        stream, _, weight = item.rpartition(":")
+        if stream and weight.isdigit() and int(weight) > 0:
+            streams[stream] = int(weight)
+        else:
+            streams[item] = 1
+    return streams
+
+
+def next_loop_interval(
+    current_interval, events_count, max_events, loop_interval, max_loop_interval
+):
+    # Keep draining while iterations are capped by max events, back off while the outbox is empty
+    if max_events and events_count >= max_events:
+        return 0
+    if events_count:
+        return loop_interval
+    return min(max(current_interval * 2, loop_interval), max_loop_interval)
+
+
 class Command(BaseCommand):
     event_relayer = EventRelayer()
+    async_event_relayer = AsyncEventRelayer()
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -25,6 +59,21 @@ class Command(BaseCommand):
             default=1,
             help="Define the sleep interval (in seconds) between each loop",
         )
+        parser.add_argument(
+            "--max-loop-interval",
+            nargs="?",
+            type=float,
+            default=None,
+            help="Double the sleep interval after each loop that finds no events, up to the given "
+            "interval (in seconds). If not provided, the loop interval doesn't grow.",
+        )
+        parser.add_argument(
+            "--listen",
+            action="store_true",
+            default=False,
+            help="Wake up the loop as soon as new events are notified (PostgreSQL only, requires the "
+            "NOTIFY_ON_INSERT setting). The loop interval becomes the longest wait between iterations.",
+        )
         parser.add_argument(
             "--stream",
             nargs="?",
@@ -32,24 +81,207 @@ class Command(BaseCommand):
             default=None,
             help="Define which stream events should be relayed. If not provided, all events will be relayed.",
         )
+        parser.add_argument(
+            "--streams",
+            nargs="?",
+            type=parse_streams,
+            default=None,
+            help="Define a comma separated list of streams relayed by this process, e.g. 'stream-a:3,stream-b'. "
+            "The optional weight multiplies the max events relayed from the stream on each iteration.",
+        )
+        parser.add_argument(
+            "--all-streams",
+            action="store_true",
+            default=False,
+            help="Relay every stream holding unsent events, including events without a stream",
+        )
+        parser.add_argument(
+            "--stream-workers",
+            nargs="?",
+            type=int,
+            default=None,
+            help="Define how many streams are relayed concurrently when relaying several streams",
+        )
+        parser.add_argument(
+            "--engine",
+            nargs="?",
+            type=str,
+            choices=["sync", "async"],
+            default="sync",
+            help="Define the relay engine. The async engine claims events through leases and publishes "
+            "them concurrently in an event loop. Only events that do not need to keep order are relayed.",
+        )
+        parser.add_argument(
+            "--max-in-flight",
+            nargs="?",
+            type=int,
+            default=None,
+            help="Define how many events the async engine publishes concurrently",
+        )
+        parser.add_argument(
+            "--batch-size",
+            nargs="?",
+            type=int,
+            default=None,
+            help="Define how many events are fetched per page and marked as sent (or deleted) "
+            "in a single query. If not provided, all events are fetched at once and updated one by one.",
+        )
+        parser.add_argument(
+            "--max-events",
+            nargs="?",
+            type=int,
+            default=None,
+            help="Define the maximum number of events relayed in each relay iteration",
+        )
+        parser.add_argument(
+            "--lease-duration",
+            nargs="?",
+            type=float,
+            default=None,
+            help="Claim events through a lease of the given duration (in seconds), allowing "
+            "several relays to run concurrently. Events are claimed in pages of --batch-size events "
+            "(100 by default). Only events that do not need to keep order are relayed.",
+        )
+        parser.add_argument(
+            "--worker-id",
+            nargs="?",
+            type=str,
+            default=None,
+            help="Define the identifier used to claim events. Defaults to the hostname and process id.",
+        )
+        parser.add_argument(
+            "--workers",
+            nargs="?",
+            type=int,
+            default=None,
+            help="Define how many threads relay events concurrently. Events that don't keep order are "
+            "acknowledged in batches as they complete. Events that keep order are relayed concurrently "
+            "only across different ordering keys.",
+        )
+        parser.add_argument(
+            "--events-per-second",
+            nargs="?",
+            type=float,
+            default=None,
+            help="Limit how many events are published per second from each relayed stream. "
+            "Overwrites the RATE_LIMITS setting.",
+        )
+        parser.add_argument(
+            "--bytes-per-second",
+            nargs="?",
+            type=int,
+            default=None,
+            help="Limit how many payload bytes are published per second from each relayed stream. "
+            "Overwrites the RATE_LIMITS setting.",
+        )
 
     def handle(self, *args, **options):
         loop_interval = options["loop_interval"]
         run_in_loop = options["run_in_loop"]
         stream = options["stream"]
+        batch_size = options["batch_size"]
+        max_events = options["max_events"]
+        lease_duration = options["lease_duration"]
+        worker_id = options["worker_id"]
+        workers = options["workers"]
+        listen = options["listen"]
+        max_loop_interval = max(options["max_loop_interval"] or 0, loop_interval)
+        streams = options["streams"]
+        all_streams = options["all_streams"]
+        stream_workers = options["stream_workers"]
+        engine = options["engine"]
+        max_in_flight = options["max_in_flight"]
+        events_per_second = options["events_per_second"]
+        bytes_per_second = options["bytes_per_second"]
+        if sum([stream is not None, streams is not None, all_streams]) > 1:
+            raise CommandError(
+                "Use only one of --stream, --streams and --all-streams options"
+            )
+        if engine == "async" and (streams is not None or all_streams or workers):
+            raise CommandError(
+                "The async engine doesn't support --streams, --all-streams and --workers options"
+            )
 
         print(f"run_in_loop: {run_in_loop}")
         print(f"loop_interval: {loop_interval}")
+        print(f"max_loop_interval: {max_loop_interval}")
         print(f"stream: {stream}")
+        print(f"streams: {streams}")
+        print(f"all_streams: {all_streams}")
+        print(f"stream_workers: {stream_workers}")
+        print(f"batch_size: {batch_size}")
+        print(f"max_events: {max_events}")
+        print(f"lease_duration: {lease_duration}")
+        print(f"workers: {workers}")
+        print(f"listen: {listen}")
+        print(f"engine: {engine}")
+        print(f"max_in_flight: {max_in_flight}")
+        print(f"events_per_second: {events_per_second}")
+        print(f"bytes_per_second: {bytes_per_second}")
         if options["run_in_loop"]:
             log.info("EVENTS-RELAY-COMMAND: Started to relay events in loop mode")
 
+            listener = None
+            if listen:
+                try:
+                    listener = EventNotificationListener()
+                except NotSupportedError as e:
+                    raise CommandError(str(e))
+
+            current_interval = loop_interval
             while True:
-                self.event_relayer.relay(stream=options["stream"])
-                sleep(options["loop_interval"])
-                log.info("EVENTS-RELAY-COMMAND: Relay iteration finished")
+                events_count = self._relay(options)
+                current_interval = next_loop_interval(
+                    current_interval,
+                    events_count or 0,
+                    max_events,
+                    loop_interval,
+                    max_loop_interval,
+                )
+                events_relay_iteration_finished.send(
+                    sender=self.__class__,
+                    events_count=events_count or 0,
+                    loop_interval=current_interval,
+                )
+                if current_interval and listener:
+                    listener.wait(current_interval, stream=stream)
+                elif current_interval:
+                    sleep(current_interval)
+                log.info(
+                    f"EVENTS-RELAY-COMMAND: Relay iteration finished, next one in {current_interval}s"
+                )
 
         else:
             log.info("EVENTS-RELAY-COMMAND: Started to relay events only once")
-            self.event_relayer.relay(stream=options["stream"])
+            self._relay(options)
             log.info("EVENTS-RELAY-COMMAND: Relay finished")
+
+    def _relay(self, options):
+        if options["engine"] == "async":
+            return async_to_sync(self.async_event_relayer.relay)(
+                stream=options["stream"],
+                batch_size=options["batch_size"],
+                max_events=options["max_events"],
+                lease_duration=options["lease_duration"],
+                worker_id=options["worker_id"],
+                max_in_flight=options["max_in_flight"],
+                events_per_second=options["events_per_second"],
+                bytes_per_second=options["bytes_per_second"],
+            )
+
+        relay_kwargs = {
+            "batch_size": options["batch_size"],
+            "max_events": options["max_events"],
+            "lease_duration": options["lease_duration"],
+            "worker_id": options["worker_id"],
+            "workers": options["workers"],
+            "events_per_second": options["events_per_second"],
+            "bytes_per_second": options["bytes_per_second"],
+        }
+        if options["streams"] is not None or options["all_streams"]:
+            return self.event_relayer.relay_streams(
+                streams=options["streams"],
+                stream_workers=options["stream_workers"],
+                **relay_kwargs,
+            )
+        return self.event_relayer.relay(stream=options["stream"], **relay_kwargs)
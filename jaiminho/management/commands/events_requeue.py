@@ -0,0 +1,59 @@
+import logging
+from argparse import ArgumentTypeError
+
+from django.core.management import BaseCommand
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from jaiminho.models import Event
+
+logger = logging.getLogger(__name__)
+
+
+def parse_moment(value):
+    moment = parse_datetime(value)
+    if moment is None:
+        raise ArgumentTypeError(f"Invalid datetime {value}, use the ISO 8601 format")
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class Command(BaseCommand):
+    help = "Requeue dead events, which exceeded the MAX_ATTEMPTS setting, so the relay retries them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stream",
+            nargs="?",
+            type=str,
+            default=None,
+            help="Define which stream events should be requeued. If not provided, all streams are requeued.",
+        )
+        parser.add_argument(
+            "--dead-after",
+            nargs="?",
+            type=parse_moment,
+            default=None,
+            help="Only requeue events that died at or after the given datetime (ISO 8601)",
+        )
+        parser.add_argument(
+            "--dead-before",
+            nargs="?",
+            type=parse_moment,
+            default=None,
+            help="Only requeue events that died before the given datetime (ISO 8601)",
+        )
+
+    def handle(self, *args, **options):
+        events_qs = Event.objects.filter(dead_at__isnull=False)
+        if options["stream"] is not None:
+            events_qs = events_qs.filter(stream=options["stream"])
+        if options["dead_after"] is not None:
+            events_qs = events_qs.filter(dead_at__gte=options["dead_after"])
+        if options["dead_before"] is not None:
+            events_qs = events_qs.filter(dead_at__lt=options["dead_before"])
+
+        requeued = events_qs.requeue()
+        logger.info(f"JAIMINHO-EVENTS-REQUEUE: Successfully requeued {requeued} events")
+        self.stdout.write(f"requeued={requeued}")
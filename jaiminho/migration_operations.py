@@ -0,0 +1,63 @@
+from django.db import migrations
+
+
+def is_table_partitioned(cursor, table):
+    # Takes a cursor, since migrations can't use jaiminho.partitioning, which imports models
+    cursor.execute(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+        [table],
+    )
+    return cursor.fetchone() is not None
+
+
+class OutboxIndexMixin:
+    # Indexes are created and dropped concurrently on PostgreSQL, unless the outbox table is
+    # partitioned, which doesn't support it. Migrations using these operations must not be atomic.
+
+    def _add_index(self, schema_editor, model, index):
+        if self._concurrently(schema_editor, model):
+            schema_editor.add_index(model, index, concurrently=True)
+        else:
+            schema_editor.add_index(model, index)
+
+    def _remove_index(self, schema_editor, model, index):
+        if self._concurrently(schema_editor, model):
+            schema_editor.remove_index(model, index, concurrently=True)
+        else:
+            schema_editor.remove_index(model, index)
+
+    def _concurrently(self, schema_editor, model):
+        if schema_editor.connection.vendor != "postgresql":
+            return False
+        with schema_editor.connection.cursor() as cursor:
+            return not is_table_partitioned(cursor, model._meta.db_table)
+
+
+class AddOutboxIndex(OutboxIndexMixin, migrations.AddIndex):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            self._add_index(schema_editor, model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            self._remove_index(schema_editor, model, self.index)
+
+
+class RemoveOutboxIndex(OutboxIndexMixin, migrations.RemoveIndex):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            from_model_state = from_state.models[app_label, self.model_name_lower]
+            index = from_model_state.get_index_by_name(self.name)
+            self._remove_index(schema_editor, model, index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            to_model_state = to_state.models[app_label, self.model_name_lower]
+            index = to_model_state.get_index_by_name(self.name)
+            self._add_index(schema_editor, model, index)
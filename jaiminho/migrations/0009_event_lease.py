@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jaiminho", "0008_event_signing_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="claimed_by",
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="lease_expires_at",
+            field=models.DateTimeField(null=True),
+        ),
+    ]
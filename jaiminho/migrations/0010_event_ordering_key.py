@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jaiminho", "0009_event_lease"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="ordering_key",
+            field=models.CharField(max_length=255, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jaiminho", "0010_event_ordering_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="function_path",
+            field=models.CharField(max_length=255, null=True),
+        ),
+    ]
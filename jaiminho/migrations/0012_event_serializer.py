@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jaiminho", "0011_event_function_path"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="serializer",
+            field=models.CharField(max_length=50, null=True),
+        ),
+    ]
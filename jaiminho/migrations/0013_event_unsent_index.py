@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:52
+
+from django.db import migrations, models
+
+from jaiminho.migration_operations import AddOutboxIndex
+
+
+class Migration(migrations.Migration):
+    # Indexes are created concurrently on PostgreSQL, which can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("jaiminho", "0012_event_serializer"),
+    ]
+
+    operations = [
+        AddOutboxIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("sent_at__isnull", True)),
+                fields=["stream", "created_at", "id"],
+                name="jaiminho_event_unsent_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:05
+
+from django.db import migrations, models
+
+from jaiminho.migration_operations import AddOutboxIndex
+
+
+class Migration(migrations.Migration):
+    # Indexes are created concurrently on PostgreSQL, which can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("jaiminho", "0013_event_unsent_index"),
+    ]
+
+    operations = [
+        AddOutboxIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("sent_at__isnull", False)),
+                fields=["sent_at"],
+                name="jaiminho_event_sent_at_idx",
+            ),
+        ),
+    ]
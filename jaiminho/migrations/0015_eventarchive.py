@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jaiminho", "0014_event_sent_at_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventArchive",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("message", models.BinaryField(max_length=65535, null=True)),
+                ("function", models.BinaryField(max_length=65535, null=True)),
+                ("function_path", models.CharField(max_length=255, null=True)),
+                ("kwargs", models.BinaryField(max_length=65535, null=True)),
+                ("serializer", models.CharField(max_length=50, null=True)),
+                ("signature", models.CharField(max_length=255, null=True)),
+                ("created_at", models.DateTimeField()),
+                ("sent_at", models.DateTimeField(db_index=True)),
+                ("stream", models.CharField(max_length=100, null=True)),
+                (
+                    "strategy",
+                    models.CharField(
+                        choices=[
+                            ("publish-on-commit", "Publish on Commit"),
+                            ("keep-order", "Keep Order"),
+                        ],
+                        max_length=100,
+                        null=True,
+                    ),
+                ),
+                ("ordering_key", models.CharField(max_length=255, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jaiminho", "0015_eventarchive"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="attempts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="last_error",
+            field=models.TextField(null=True),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="next_attempt_at",
+            field=models.DateTimeField(null=True),
+        ),
+    ]
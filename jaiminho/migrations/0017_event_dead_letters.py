@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:10
+
+from django.db import migrations, models
+
+from jaiminho.migration_operations import AddOutboxIndex, RemoveOutboxIndex
+
+
+class Migration(migrations.Migration):
+    # Indexes are created concurrently on PostgreSQL, which can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("jaiminho", "0016_event_retries"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="dead_at",
+            field=models.DateTimeField(null=True),
+        ),
+        # The new relay index is built before dropping the old one, so the relay query is never left without one
+        AddOutboxIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(
+                    ("dead_at__isnull", True), ("sent_at__isnull", True)
+                ),
+                fields=["stream", "created_at", "id"],
+                name="jaiminho_event_pending_idx",
+            ),
+        ),
+        AddOutboxIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("dead_at__isnull", False)),
+                fields=["stream", "dead_at"],
+                name="jaiminho_event_dead_idx",
+            ),
+        ),
+        RemoveOutboxIndex(
+            model_name="event",
+            name="jaiminho_event_unsent_idx",
+        ),
+    ]
@@ -1,6 +1,7 @@
 import dill
+from asgiref.sync import sync_to_async
 
-from django.db import models
+from django.db import connections, models, transaction
 from django.utils import timezone
 from django.core.signing import Signer, BadSignature
 
@@ -8,13 +9,71 @@ from jaiminho.constants import PublishStrategyType
 from jaiminho import settings
 
 MAX_BYTES = 65535
+# Fields covered by the event signature
+SIGNED_FIELDS = {"message", "function", "kwargs", "function_path"}
+
+
+class EventQuerySet(models.QuerySet):
+    def mark_as_sent(self):
+        return self.update(sent_at=timezone.now())
+
+    async def amark_as_sent(self):
+        return await self.aupdate(sent_at=timezone.now())
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.signature = obj._generate_event_signature()
+
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def archive(self):
+        # Moves the events to the archive table with a single INSERT ... SELECT
+        fields = [field.attname for field in EventArchive._meta.concrete_fields]
+        select_qs = (
+            self.order_by()
+            .annotate(
+                archived_sent_at=models.Value(
+                    timezone.now(), output_field=models.DateTimeField()
+                )
+            )
+            .values_list(
+                *[field for field in fields if field != "sent_at"], "archived_sent_at"
+            )
+        )
+        select_sql, params = select_qs.query.get_compiler(self.db).as_sql()
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+        columns = ", ".join(
+            quote_name(EventArchive._meta.get_field(field).column)
+            for field in fields
+            if field != "sent_at"
+        )
+
+        with transaction.atomic(using=self.db):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {quote_name(EventArchive._meta.db_table)} "
+                    f"({columns}, {quote_name('sent_at')}) {select_sql}",
+                    params,
+                )
+            return self._raw_delete(self.db)
+
+    async def aarchive(self):
+        return await sync_to_async(self.archive)()
+
+    def requeue(self):
+        # Dead events get all their attempts back
+        return self.update(dead_at=None, attempts=0, next_attempt_at=None)
 
 
 class Event(models.Model):
     id = models.BigAutoField(primary_key=True)
     message = models.BinaryField(null=True, max_length=MAX_BYTES)
     function = models.BinaryField(null=True, max_length=MAX_BYTES)
+    function_path = models.CharField(max_length=255, null=True)
     kwargs = models.BinaryField(null=True, max_length=MAX_BYTES)
+    serializer = models.CharField(max_length=50, null=True)
     signature = models.CharField(null=True, max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
     sent_at = models.DateTimeField(null=True)
@@ -22,10 +81,45 @@ class Event(models.Model):
     strategy = models.CharField(
         max_length=100, null=True, choices=PublishStrategyType.CHOICES
     )
+    ordering_key = models.CharField(max_length=255, null=True)
+    claimed_by = models.CharField(max_length=255, null=True)
+    lease_expires_at = models.DateTimeField(null=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(null=True)
+    next_attempt_at = models.DateTimeField(null=True)
+    dead_at = models.DateTimeField(null=True)
+
+    objects = EventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Serves the relay query, which only looks for unsent events that aren't dead
+            models.Index(
+                fields=["stream", "created_at", "id"],
+                condition=models.Q(sent_at__isnull=True, dead_at__isnull=True),
+                name="jaiminho_event_pending_idx",
+            ),
+            # Serves the event cleaner, which only looks for sent events
+            models.Index(
+                fields=["sent_at"],
+                condition=models.Q(sent_at__isnull=False),
+                name="jaiminho_event_sent_at_idx",
+            ),
+            # Serves the requeue command, which only looks for dead events
+            models.Index(
+                fields=["stream", "dead_at"],
+                condition=models.Q(dead_at__isnull=False),
+                name="jaiminho_event_dead_idx",
+            ),
+        ]
 
     def mark_as_sent(self):
+        # Only sends sent_at, instead of signing the event again and writing back its payload
         self.sent_at = timezone.now()
-        self.save()
+        self.save(update_fields=["sent_at"])
+
+    def archive(self):
+        Event.objects.filter(pk=self.pk).archive()
 
     def __str__(self):
         return f"Event(id={self.id})"
@@ -46,9 +140,10 @@ class Event(models.Model):
         if not settings.sign_events:
             return None
 
+        function_path = self.function_path.encode() if self.function_path else None
         payload_to_sign = [
             value
-            for value in [self.message, self.function, self.kwargs]
+            for value in [self.message, self.function, self.kwargs, function_path]
             if value is not None
         ]
         blob = b"".join(payload_to_sign)
@@ -65,6 +160,30 @@ class Event(models.Model):
             raise BadSignature(f"{self} has been tampered")
 
     def save(self, *args, **kwargs):
-        self.signature = self._generate_event_signature()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or SIGNED_FIELDS.intersection(update_fields):
+            self.signature = self._generate_event_signature()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "signature"}
 
         super().save(*args, **kwargs)
+
+
+class EventArchive(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    message = models.BinaryField(null=True, max_length=MAX_BYTES)
+    function = models.BinaryField(null=True, max_length=MAX_BYTES)
+    function_path = models.CharField(max_length=255, null=True)
+    kwargs = models.BinaryField(null=True, max_length=MAX_BYTES)
+    serializer = models.CharField(max_length=50, null=True)
+    signature = models.CharField(null=True, max_length=255)
+    created_at = models.DateTimeField()
+    sent_at = models.DateTimeField(db_index=True)
+    stream = models.CharField(max_length=100, null=True)
+    strategy = models.CharField(
+        max_length=100, null=True, choices=PublishStrategyType.CHOICES
+    )
+    ordering_key = models.CharField(max_length=255, null=True)
+
+    def __str__(self):
+        return f"EventArchive(id={self.id})"
@@ -0,0 +1,80 @@
+import logging
+import select
+from time import monotonic
+
+from django.db import NotSupportedError, connections
+
+from jaiminho import settings
+from jaiminho.models import Event
+
+logger = logging.getLogger(__name__)
+
+
+def notify_event_created(stream=None, using=None):
+    # NOTIFY is transactional, so listeners are only woken once the event is committed
+    if not settings.notify_on_insert:
+        return
+
+    connection = connections[using or Event.objects.db]
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_notify(%s, %s)", [settings.notify_channel, stream or ""]
+        )
+
+
+class EventNotificationListener:
+    def __init__(self, channel=None, using=None):
+        self.channel = channel or settings.notify_channel
+        self.connection = connections[using or Event.objects.db]
+        if self.connection.vendor != "postgresql":
+            raise NotSupportedError(
+                f"Listening to event notifications is only supported on PostgreSQL, "
+                f"not on {self.connection.vendor}"
+            )
+        self._listening_connection = None
+
+    def _listen(self):
+        # LISTEN is bound to the database session, so it's issued again after reconnections
+        self.connection.ensure_connection()
+        if self.connection.connection is self._listening_connection:
+            return
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {self.connection.ops.quote_name(self.channel)}")
+        self._listening_connection = self.connection.connection
+        logger.info(
+            f"JAIMINHO-EVENTS-RELAY: Listening to event notifications on {self.channel}"
+        )
+
+    def _poll(self, timeout):
+        raw_connection = self.connection.connection
+        if hasattr(raw_connection, "notifies") and callable(raw_connection.notifies):
+            # psycopg 3
+            return [
+                notify.payload
+                for notify in raw_connection.notifies(timeout=timeout, stop_after=1)
+            ]
+
+        # psycopg2
+        if not raw_connection.notifies:
+            select.select([raw_connection], [], [], timeout)
+            raw_connection.poll()
+        payloads = [notify.payload for notify in raw_connection.notifies]
+        raw_connection.notifies.clear()
+        return payloads
+
+    def wait(self, timeout, stream=None):
+        # Returns whether an event of the stream was notified before the timeout
+        self._listen()
+        deadline = monotonic() + timeout
+        while True:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return False
+
+            payloads = self._poll(remaining)
+            if any(stream is None or payload == stream for payload in payloads):
+                return True
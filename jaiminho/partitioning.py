@@ -0,0 +1,256 @@
+import logging
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.db import NotSupportedError, OperationalError, connections, transaction
+from django.utils import timezone
+
+from jaiminho.migration_operations import is_table_partitioned
+from jaiminho.models import Event
+
+logger = logging.getLogger(__name__)
+
+PARTITION_INTERVALS = {"daily": timedelta(days=1), "weekly": timedelta(weeks=1)}
+PARTITION_DATE_FORMAT = "%Y%m%d"
+# Dropping a partition locks the whole outbox table, so give up instead of
+# queueing behind long running transactions (and blocking everyone queued behind us)
+LOCK_TIMEOUT = "5s"
+
+
+def _get_connection(using=None):
+    connection = connections[using or Event.objects.db]
+    if connection.vendor != "postgresql":
+        raise NotSupportedError(
+            f"Outbox partitioning is only supported on PostgreSQL, not on {connection.vendor}"
+        )
+    return connection
+
+
+def partition_start(moment, interval):
+    day = moment.astimezone(dt_timezone.utc).date()
+    if interval == "weekly":
+        day -= timedelta(days=day.weekday())
+    return datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+
+
+def partition_ranges(start, end, interval):
+    current = partition_start(start, interval)
+    while current < end:
+        yield current, current + PARTITION_INTERVALS[interval]
+        current += PARTITION_INTERVALS[interval]
+
+
+def partition_name(start, end):
+    return (
+        f"{Event._meta.db_table}_p"
+        f"{start.strftime(PARTITION_DATE_FORMAT)}_{end.strftime(PARTITION_DATE_FORMAT)}"
+    )
+
+
+def parse_partition_name(name):
+    prefix = f"{Event._meta.db_table}_p"
+    if not name.startswith(prefix):
+        return None
+    try:
+        start, end = name[len(prefix) :].split("_")
+        return (
+            datetime.strptime(start, PARTITION_DATE_FORMAT).replace(
+                tzinfo=dt_timezone.utc
+            ),
+            datetime.strptime(end, PARTITION_DATE_FORMAT).replace(
+                tzinfo=dt_timezone.utc
+            ),
+        )
+    except ValueError:
+        return None
+
+
+def is_partitioned(using=None):
+    connection = _get_connection(using)
+    with connection.cursor() as cursor:
+        return is_table_partitioned(cursor, Event._meta.db_table)
+
+
+def list_partitions(using=None):
+    connection = _get_connection(using)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = %s AND pg_table_is_visible(p.oid) "
+            "ORDER BY c.relname",
+            [Event._meta.db_table],
+        )
+        partitions = []
+        for (name,) in cursor.fetchall():
+            bounds = parse_partition_name(name)
+            if bounds is not None:
+                partitions.append((name, *bounds))
+        return partitions
+
+
+def _create_partition(connection, cursor, start, end):
+    quote_name = connection.ops.quote_name
+    table = Event._meta.db_table
+    name = partition_name(start, end)
+
+    cursor.execute(
+        f"CREATE TABLE {quote_name(name)} (LIKE {quote_name(table)} INCLUDING DEFAULTS)"
+    )
+    # Events created before the partition existed live in the default partition,
+    # which can't hold rows of an attached range
+    cursor.execute(
+        f"WITH moved AS ("
+        f"DELETE FROM {quote_name(table + '_default')} "
+        f"WHERE created_at >= %s AND created_at < %s RETURNING *"
+        f") INSERT INTO {quote_name(name)} SELECT * FROM moved",
+        [start, end],
+    )
+    cursor.execute(
+        f"ALTER TABLE {quote_name(table)} ATTACH PARTITION {quote_name(name)} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+    logger.info(f"JAIMINHO-PARTITIONING: Created partition {name}")
+    return name
+
+
+def create_partitions(interval, premake, using=None, start=None):
+    connection = _get_connection(using)
+    now = timezone.now()
+    end = partition_start(now, interval) + PARTITION_INTERVALS[interval] * (premake + 1)
+    existing = list_partitions(using)
+
+    created = []
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for range_start, range_end in partition_ranges(start or now, end, interval):
+            if any(
+                range_start < existing_end and existing_start < range_end
+                for _, existing_start, existing_end in existing
+            ):
+                continue
+            created.append(
+                _create_partition(connection, cursor, range_start, range_end)
+            )
+    return created
+
+
+def setup_partitioning(interval, premake, using=None):
+    connection = _get_connection(using)
+    quote_name = connection.ops.quote_name
+    table = Event._meta.db_table
+    unpartitioned_table = f"{table}_unpartitioned"
+    sequence = f"{table}_partitioned_id_seq"
+
+    with transaction.atomic(using=connection.alias):
+        with connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {quote_name(table)} IN ACCESS EXCLUSIVE MODE")
+            cursor.execute(
+                f"ALTER TABLE {quote_name(table)} RENAME TO {quote_name(unpartitioned_table)}"
+            )
+            cursor.execute(
+                f"CREATE TABLE {quote_name(table)} "
+                f"(LIKE {quote_name(unpartitioned_table)} INCLUDING DEFAULTS) "
+                f"PARTITION BY RANGE (created_at)"
+            )
+            # Identity columns aren't supported on partitioned tables before PostgreSQL 17
+            cursor.execute(f"CREATE SEQUENCE {quote_name(sequence)}")
+            cursor.execute(
+                f"ALTER TABLE {quote_name(table)} ALTER COLUMN id "
+                f"SET DEFAULT nextval('{sequence}'::regclass)"
+            )
+            cursor.execute(
+                f"ALTER SEQUENCE {quote_name(sequence)} OWNED BY {quote_name(table)}.id"
+            )
+            cursor.execute(
+                f"CREATE TABLE {quote_name(table + '_default')} "
+                f"PARTITION OF {quote_name(table)} DEFAULT"
+            )
+
+            cursor.execute(
+                f"SELECT MIN(created_at) FROM {quote_name(unpartitioned_table)}"
+            )
+            (oldest,) = cursor.fetchone()
+            now = timezone.now()
+            end = partition_start(now, interval) + PARTITION_INTERVALS[interval] * (
+                premake + 1
+            )
+            created = [
+                _create_partition(connection, cursor, range_start, range_end)
+                for range_start, range_end in partition_ranges(
+                    min(oldest or now, now), end, interval
+                )
+            ]
+
+            cursor.execute(
+                f"INSERT INTO {quote_name(table)} SELECT * FROM {quote_name(unpartitioned_table)}"
+            )
+            cursor.execute(
+                f"SELECT setval(%s, COALESCE((SELECT MAX(id) FROM {quote_name(table)}), 0) + 1, false)",
+                [sequence],
+            )
+            cursor.execute(f"DROP TABLE {quote_name(unpartitioned_table)}")
+            # The partition key must be part of the primary key
+            cursor.execute(
+                f"ALTER TABLE {quote_name(table)} "
+                f"ADD CONSTRAINT {quote_name(table + '_pkey')} PRIMARY KEY (id, created_at)"
+            )
+
+        with connection.schema_editor(atomic=False) as schema_editor:
+            for index in Event._meta.indexes:
+                schema_editor.add_index(Event, index)
+
+    logger.info(
+        f"JAIMINHO-PARTITIONING: Partitioned {table} by created_at ({interval})"
+    )
+    return created
+
+
+def _drop_partition(connection, name, threshold):
+    # Returns whether the partition was dropped
+    quote_name = connection.ops.quote_name
+    table = Event._meta.db_table
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+        cursor.execute(f"LOCK TABLE {quote_name(table)} IN ACCESS EXCLUSIVE MODE")
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {quote_name(name)} "
+            f"WHERE sent_at IS NULL OR sent_at >= %s)",
+            [threshold],
+        )
+        (has_pending_events,) = cursor.fetchone()
+        if has_pending_events:
+            logger.info(
+                f"JAIMINHO-PARTITIONING: Keeping partition {name}, "
+                f"it holds events not sent before {threshold}"
+            )
+            return False
+
+        cursor.execute(
+            f"ALTER TABLE {quote_name(table)} DETACH PARTITION {quote_name(name)}"
+        )
+        cursor.execute(f"DROP TABLE {quote_name(name)}")
+        return True
+
+
+def drop_expired_partitions(threshold, using=None):
+    connection = _get_connection(using)
+
+    dropped = []
+    for name, _, end in list_partitions(using):
+        if end > threshold:
+            continue
+
+        try:
+            if not _drop_partition(connection, name, threshold):
+                continue
+        except OperationalError as e:
+            # Most likely the lock timeout, the partition is dropped on the next run
+            logger.warning(
+                f"JAIMINHO-PARTITIONING: Skipping partition {name}, it could not be dropped: {e}"
+            )
+            continue
+
+        logger.info(f"JAIMINHO-PARTITIONING: Dropped partition {name}")
+        dropped.append(name)
+    return dropped
@@ -1,53 +1,117 @@
 import logging
+import threading
 from abc import ABC, abstractmethod
 import dill
 
 from django.db import transaction
 
+from jaiminho.buffer import get_outbox_buffer
+from jaiminho.compression import compress
 from jaiminho.constants import PublishStrategyType
+from jaiminho.coroutines import call_publisher
 from jaiminho.models import Event
+from jaiminho.notifications import notify_event_created
+from jaiminho.registry import get_function_reference
+from jaiminho.serializers import DillSerializer, get_serializer
 from jaiminho.signals import event_published, event_failed_to_publish, get_event_payload
 from jaiminho import settings
 
 logger = logging.getLogger(__name__)
 
+_local = threading.local()
 
-def create_event_data(func, args, kwargs, strategy, stream=None):
-    args_dump = dill.dumps(args)
-    func_dump = dill.dumps(func)
-    kwargs_dump = dill.dumps(kwargs) if bool(kwargs) else None
+
+def _serialize_payload(args, kwargs):
+    serializer = get_serializer(settings.serializer)
+
+    try:
+        args_dump = serializer.dumps(args)
+        kwargs_dump = serializer.dumps(kwargs) if bool(kwargs) else None
+        # Payloads must reach the publisher as they would on commit, so values the
+        # serializer converts (such as datetimes or tuples in JSON) are pickled instead
+        if not serializer.preserves_types and (
+            serializer.loads_message(args_dump) != args
+            or (kwargs_dump is not None and serializer.loads(kwargs_dump) != kwargs)
+        ):
+            raise ValueError("Payload types are not preserved")
+    except Exception as exc:
+        if isinstance(serializer, DillSerializer):
+            raise
+        logger.info(
+            f"JAIMINHO-SAVE-TO-OUTBOX: Payload not supported by {serializer.name} serializer, "
+            f"falling back to dill. Error: {exc}"
+        )
+        serializer = DillSerializer()
+        args_dump = serializer.dumps(args)
+        kwargs_dump = serializer.dumps(kwargs) if bool(kwargs) else None
+
+    return serializer.name, args_dump, kwargs_dump
+
+
+def _compression_codec(stream):
+    if stream in settings.stream_compression:
+        return settings.stream_compression[stream]
+    return settings.compression
+
+
+def create_event_data(func, args, kwargs, strategy, stream=None, ordering_key=None):
+    serializer, args_dump, kwargs_dump = _serialize_payload(args, kwargs)
+    codec = _compression_codec(stream)
+    args_dump = compress(args_dump, codec, settings.compression_threshold)
+    kwargs_dump = compress(kwargs_dump, codec, settings.compression_threshold)
+    function_path = (
+        get_function_reference(func) if settings.store_function_reference else None
+    )
+    func_dump = dill.dumps(func) if function_path is None else None
 
     return {
         "message": args_dump,
         "function": func_dump,
+        "function_path": function_path,
         "kwargs": kwargs_dump,
+        "serializer": serializer,
         "strategy": strategy,
         "stream": stream,
+        "ordering_key": ordering_key,
     }
 
 
+def persist_event(event_data, args):
+    event = Event(**event_data)
+
+    buffer = get_outbox_buffer()
+    if buffer is None:
+        event.save()
+        logger.info(
+            f"JAIMINHO-SAVE-TO-OUTBOX: Event created: Event {event}, Payload: {args}"
+        )
+    else:
+        buffer.add(event)
+        logger.info(f"JAIMINHO-SAVE-TO-OUTBOX: Event buffered. Payload: {args}")
+
+    return event
+
+
 class BaseStrategy(ABC):
     @abstractmethod
-    def publish(self, args, kwargs, func, stream=None):
+    def publish(self, args, kwargs, func, stream=None, ordering_key=None):
         raise NotImplementedError
 
 
 class PublishOnCommitStrategy(BaseStrategy):
-    def publish(self, args, kwargs, func, stream=None):
+    def publish(self, args, kwargs, func, stream=None, ordering_key=None):
         event_data = create_event_data(
             func,
             args,
             kwargs,
             PublishStrategyType.PUBLISH_ON_COMMIT,
             stream=stream,
+            ordering_key=ordering_key,
         )
 
         event = None
         if settings.persist_all_events:
-            event = Event.objects.create(**event_data)
-            logger.info(
-                f"JAIMINHO-SAVE-TO-OUTBOX: Event created: Event {event}, Payload: {args}"
-            )
+            event = persist_event(event_data, args)
 
         on_commit_hook_kwargs = {
             "func": func,
@@ -56,25 +120,27 @@ class PublishOnCommitStrategy(BaseStrategy):
             "args": args,
             "kwargs": kwargs,
         }
-        transaction.on_commit(lambda: on_commit_hook(**on_commit_hook_kwargs))
+        if settings.coalesce_on_commit_hooks:
+            add_to_on_commit_batch(on_commit_hook_kwargs)
+        else:
+            transaction.on_commit(lambda: on_commit_hook(**on_commit_hook_kwargs))
         logger.info(
             f"JAIMINHO-SAVE-TO-OUTBOX: On commit hook configured. Event: {event}"
         )
 
 
 class KeepOrderStrategy(BaseStrategy):
-    def publish(self, args, kwargs, func, stream=None):
+    def publish(self, args, kwargs, func, stream=None, ordering_key=None):
         event_data = create_event_data(
             func,
             args,
             kwargs,
             PublishStrategyType.KEEP_ORDER,
             stream=stream,
+            ordering_key=ordering_key,
         )
-        event = Event.objects.create(**event_data)
-        logger.info(
-            f"JAIMINHO-SAVE-TO-OUTBOX: Event created: Event {event}, Payload: {args}"
-        )
+        persist_event(event_data, args)
+        notify_event_created(stream)
 
 
 def create_publish_strategy(strategy_type):
@@ -93,13 +159,14 @@ def on_commit_hook(func, event, event_data, args, kwargs):
     event_payload = get_event_payload(args)
 
     try:
-        func(*args, **kwargs)
+        call_publisher(func, args, kwargs)
         logger.info(
             f"JAIMINHO-ON-COMMIT-HOOK: Event sent successfully. Payload: {args}"
         )
     except BaseException as exc:
         if not event:
             event = Event.objects.create(**event_data)
+        notify_event_created(event.stream)
 
         logger.warning(
             f"JAIMINHO-ON-COMMIT-HOOK: Event failed to be published. Event: {event}, Payload: {args}, "
@@ -116,8 +183,109 @@ def on_commit_hook(func, event, event_data, args, kwargs):
                 f"JAIMINHO-ON-COMMIT-HOOK: Event deleted after success send. Event: {event}, Payload: {args}"
             )
             event.delete()
+        elif settings.archive_sent_events:
+            logger.info(
+                f"JAIMINHO-ON-COMMIT-HOOK: Event archived after success send. Event: {event}, Payload: {args}"
+            )
+            event.archive()
         else:
             logger.info(
                 f"JAIMINHO-ON-COMMIT-HOOK: Event marked as sent. Event: {event}, Payload: {args}"
             )
             event.mark_as_sent()
+
+
+class OnCommitBatch:
+    def __init__(self, savepoint_ids):
+        self.savepoint_ids = savepoint_ids
+        self.hooks_kwargs = []
+        self.dispatched = False
+
+    def __call__(self):
+        self.dispatched = True
+        on_commit_batch_hook(self.hooks_kwargs)
+
+    def is_registered(self, connection):
+        # Hooks are discarded when their transaction (or savepoint) is rolled back
+        return any(hook[1] is self for hook in reversed(connection.run_on_commit))
+
+
+def add_to_on_commit_batch(on_commit_hook_kwargs):
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        on_commit_hook(**on_commit_hook_kwargs)
+        return
+
+    # A batch is registered for each savepoint, so rolling back a savepoint
+    # discards only the events published inside it
+    savepoint_ids = tuple(connection.savepoint_ids)
+    batch = getattr(_local, "on_commit_batch", None)
+    if (
+        batch is None
+        or batch.dispatched
+        or batch.savepoint_ids != savepoint_ids
+        or not batch.is_registered(connection)
+    ):
+        batch = OnCommitBatch(savepoint_ids)
+        _local.on_commit_batch = batch
+        transaction.on_commit(batch)
+
+    batch.hooks_kwargs.append(on_commit_hook_kwargs)
+
+
+def on_commit_batch_hook(hooks_kwargs):
+    sent_events = []
+    failed_events = []
+    failed_streams = set()
+
+    for hook_kwargs in hooks_kwargs:
+        func = hook_kwargs["func"]
+        args = hook_kwargs["args"]
+        event_payload = get_event_payload(args)
+
+        try:
+            call_publisher(func, args, hook_kwargs["kwargs"])
+            logger.info(
+                f"JAIMINHO-ON-COMMIT-HOOK: Event sent successfully. Payload: {args}"
+            )
+        except BaseException as exc:
+            if not hook_kwargs["event"]:
+                failed_events.append(Event(**hook_kwargs["event_data"]))
+            failed_streams.add(hook_kwargs["event_data"]["stream"])
+
+            logger.warning(
+                f"JAIMINHO-ON-COMMIT-HOOK: Event failed to be published. Event: {hook_kwargs['event']}, "
+                f"Payload: {args}, Exception: {exc}"
+            )
+            event_failed_to_publish.send(sender=func, event_payload=event_payload)
+            continue
+
+        event_published.send(sender=func, event_payload=event_payload)
+        if hook_kwargs["event"]:
+            sent_events.append(hook_kwargs["event"])
+
+    if failed_events:
+        Event.objects.bulk_create(failed_events)
+        logger.info(
+            f"JAIMINHO-ON-COMMIT-HOOK: {len(failed_events)} failed events created"
+        )
+    for stream in failed_streams:
+        notify_event_created(stream)
+
+    if sent_events:
+        events_qs = Event.objects.filter(id__in=[event.id for event in sent_events])
+        if settings.delete_after_send:
+            events_qs.delete()
+            logger.info(
+                f"JAIMINHO-ON-COMMIT-HOOK: {len(sent_events)} events deleted after success send"
+            )
+        elif settings.archive_sent_events:
+            events_qs.archive()
+            logger.info(
+                f"JAIMINHO-ON-COMMIT-HOOK: {len(sent_events)} events archived after success send"
+            )
+        else:
+            events_qs.mark_as_sent()
+            logger.info(
+                f"JAIMINHO-ON-COMMIT-HOOK: {len(sent_events)} events marked as sent"
+            )
@@ -0,0 +1,46 @@
+import threading
+from time import monotonic
+
+
+class TokenBucket:
+    # Refills at `rate` tokens per second, holding up to a second worth of tokens
+    # unless a capacity is given.
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated_at = monotonic()
+        # Refilling and taking tokens must be a single step, since the worker
+        # threads relaying a stream draw from the same bucket
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        # Takes the tokens right away, running into debt if needed, and returns how
+        # long (in seconds) the caller must wait before using them. Requests larger
+        # than the capacity are served once the bucket is full, instead of never.
+        with self._lock:
+            now = monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            self.tokens -= tokens
+            return max(0, -self.tokens / self.rate)
+
+
+class RateLimiter:
+    def __init__(self, events_per_second=None, bytes_per_second=None):
+        self.limits = (events_per_second, bytes_per_second)
+        self._events_bucket = (
+            TokenBucket(events_per_second) if events_per_second else None
+        )
+        self._bytes_bucket = TokenBucket(bytes_per_second) if bytes_per_second else None
+
+    def reserve(self, size):
+        delay = 0
+        if self._events_bucket:
+            delay = max(delay, self._events_bucket.reserve())
+        if self._bytes_bucket:
+            delay = max(delay, self._bytes_bucket.reserve(size))
+        return delay
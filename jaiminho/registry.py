@@ -0,0 +1,34 @@
+from importlib import import_module
+
+_functions = {}
+
+
+def _reference(func):
+    return f"{func.__module__}:{func.__qualname__}"
+
+
+def register_function(func):
+    # Functions defined inside other functions can't be imported back by the relay
+    if "<locals>" in func.__qualname__:
+        return
+    _functions[_reference(func)] = func
+
+
+def get_function_reference(func):
+    reference = _reference(func)
+    if _functions.get(reference) is func:
+        return reference
+    return None
+
+
+def resolve_function_reference(reference):
+    if reference not in _functions:
+        module_name, qualname = reference.split(":", 1)
+        # Importing the module registers its decorated functions
+        module = import_module(module_name)
+        if reference not in _functions:
+            fn = module
+            for attribute in qualname.split("."):
+                fn = getattr(fn, attribute)
+            return getattr(fn, "original_func", fn)
+    return _functions[reference]
@@ -1,10 +1,30 @@
+import hashlib
 import logging
+import os
+import socket
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from functools import lru_cache
+from time import sleep
+
 import dill
 
 from django.core.signing import BadSignature
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
 
+from jaiminho.circuit_breaker import CircuitBreaker
+from jaiminho.compression import decompress
 from jaiminho.constants import PublishStrategyType
+from jaiminho.coroutines import call_publisher
 from jaiminho.models import Event
+from jaiminho.rate_limits import RateLimiter
+from jaiminho.registry import resolve_function_reference
+from jaiminho.retries import backoff_delay
+from jaiminho.serializers import get_serializer
 from jaiminho.signals import (
     event_published_by_events_relay,
     event_failed_to_publish_by_events_relay,
@@ -14,6 +34,9 @@ from jaiminho import settings
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_ACKNOWLEDGE_BATCH_SIZE = 100
+DEFAULT_CLAIM_BATCH_SIZE = 100
+
 
 def _capture_exception(exception):
     capture_exception = settings.default_capture_exception
@@ -21,92 +44,638 @@ def _capture_exception(exception):
         capture_exception(exception)
 
 
-def _extract_original_func(event):
-    fn = dill.loads(event.function)
-    original_fn = getattr(fn, "original_func", fn)
-    return original_fn
+def _ordered_events_q():
+    ordered_events_q = Q(strategy=PublishStrategyType.KEEP_ORDER)
+    if settings.publish_strategy == PublishStrategyType.KEEP_ORDER:
+        ordered_events_q |= Q(strategy__isnull=True)
+    return ordered_events_q
+
+
+def _due_events_q(now):
+    return Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now)
+
+
+def _close_connection_after(func, *args):
+    # Worker threads hold their own connection, which publishers and signal receivers
+    # may open, and the threads are discarded after each relay
+    try:
+        return func(*args)
+    finally:
+        connection.close()
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
 
 
 class EventRelayer:
-    def relay(self, stream=None):
-        events_qs = Event.objects.select_for_update(skip_locked=True).filter(sent_at__isnull=True)
-        events_qs = events_qs.filter(stream=stream)
-        events_qs = events_qs.order_by("created_at")
+    def __init__(self, function_cache_size=None):
+        if function_cache_size is None:
+            function_cache_size = settings.function_cache_size
+        # Outboxes usually hold lots of events pointing to a few functions,
+        # so unpickled functions are cached by their pickled blob
+        self._load_function = lru_cache(maxsize=function_cache_size)(dill.loads)
+        self._streams_rotation = 0
+        self._circuit_breakers = {}
+        self._circuit_breakers_lock = threading.Lock()
+        self._rate_limiters = {}
+        self._rate_limiters_lock = threading.Lock()
+
+    def stats(self):
+        function_cache_info = self._load_function.cache_info()
+        with self._circuit_breakers_lock:
+            circuit_breakers = dict(self._circuit_breakers)
+        return {
+            "function_cache_hits": function_cache_info.hits,
+            "function_cache_misses": function_cache_info.misses,
+            "function_cache_size": function_cache_info.currsize,
+            "circuit_breakers": {
+                function: circuit_breaker.stats()
+                for function, circuit_breaker in circuit_breakers.items()
+            },
+        }
+
+    def relay(
+        self,
+        stream=None,
+        batch_size=None,
+        max_events=None,
+        lease_duration=None,
+        worker_id=None,
+        workers=None,
+        events_per_second=None,
+        bytes_per_second=None,
+    ):
+        # Returns how many events were published, so callers can back off while
+        # the outbox is empty or the relay is held back by a failing event
+        events_count = 0
+        sent_count = 0
+        blocked_ordering_keys = set()
+        self._configure_rate_limiter(stream, events_per_second, bytes_per_second)
+
+        if lease_duration:
+            pages = self._claim_events(
+                stream,
+                batch_size or DEFAULT_CLAIM_BATCH_SIZE,
+                max_events,
+                lease_duration,
+                worker_id or default_worker_id(),
+            )
+        else:
+            pages = self._fetch_events(stream, batch_size, max_events)
+
+        executor = (
+            ThreadPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+        )
+        try:
+            for events in pages:
+                events_count += len(events)
+                page_sent_count, stuck = self._relay_page(
+                    events,
+                    batch_size,
+                    blocked_ordering_keys,
+                    executor,
+                    leased=bool(lease_duration),
+                )
+                sent_count += page_sent_count
+                if stuck:
+                    break
+        finally:
+            if executor:
+                executor.shutdown()
 
-        if not events_qs:
+        if not events_count:
             logger.info("No failed events found.")
-            return
+        else:
+            logger.info(f"JAIMINHO-EVENTS-RELAY: Relay stats: {self.stats()}")
+
+        return sent_count
+
+    def pending_streams(self):
+        return list(
+            Event.objects.filter(sent_at__isnull=True, dead_at__isnull=True)
+            .order_by("stream")
+            .values_list("stream", flat=True)
+            .distinct()
+        )
+
+    def relay_streams(
+        self, streams=None, stream_workers=None, max_events=None, **relay_kwargs
+    ):
+        # Streams are a list or a mapping of stream to weight, which multiplies
+        # the max events relayed from the stream on each call
+        if streams is None:
+            streams = self.pending_streams()
+        weights = streams if isinstance(streams, dict) else dict.fromkeys(streams, 1)
+        if not weights:
+            logger.info("No failed events found.")
+            return 0
 
-        for event in events_qs:
-            event_payload = {}
+        # Start from a different stream on each call, so none is always relayed last
+        ordered_streams = list(weights)
+        offset = self._streams_rotation % len(ordered_streams)
+        ordered_streams = ordered_streams[offset:] + ordered_streams[:offset]
+        self._streams_rotation += 1
 
+        def relay_stream(stream):
+            return self.relay(
+                stream=stream,
+                max_events=max_events * weights[stream] if max_events else None,
+                **relay_kwargs,
+            )
+
+        if not stream_workers or stream_workers <= 1:
+            return sum(relay_stream(stream) for stream in ordered_streams)
+
+        def relay_stream_in_thread(stream):
             try:
-                event.verify_integrity()
-                args = dill.loads(event.message)
-                kwargs = dill.loads(event.kwargs) if event.kwargs else {}
-                event_payload = get_event_payload(args)
-
-                original_fn = _extract_original_func(event)
-                if isinstance(args, tuple):
-                    original_fn(*args, **kwargs)
-                else:
-                    original_fn(args, **kwargs)
+                return relay_stream(stream)
+            finally:
+                # Each thread holds its own connection
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=stream_workers) as executor:
+            return sum(executor.map(relay_stream_in_thread, ordered_streams))
 
-                logger.info(f"JAIMINHO-EVENTS-RELAY: Event sent. Event {event}")
+    def _relay_page(
+        self, events, batch_size, blocked_ordering_keys, executor, leased=False
+    ):
+        # Returns how many events were published and whether the relay is stuck
+        sent_count = 0
+        sent_events = []
+        failed_events = []
+        futures = []
+        unordered_futures = {}
+        stuck = False
 
-                if settings.delete_after_send:
-                    event.delete()
-                    logger.info(
-                        f"JAIMINHO-EVENTS-RELAY: Event deleted after success send. Event: {event}, Payload: {args}"
+        if executor:
+            # Events that don't keep order are relayed concurrently, as well as events sharing
+            # an ordering key, which are relayed in order by the same worker. Events with an
+            # ordering key behind an event without one wait for it, like without workers.
+            events_by_ordering_key = defaultdict(list)
+            serial_events = []
+            for event in events:
+                ordering_key = self._ordering_key(event)
+                if not self.__stuck_on_error(event):
+                    future = executor.submit(
+                        _close_connection_after, self._relay_event, event, leased
                     )
+                    unordered_futures[future] = event
+                elif ordering_key is None or serial_events:
+                    serial_events.append(event)
                 else:
-                    event.mark_as_sent()
-                    logger.info(
-                        f"JAIMINHO-EVENTS-RELAY: Event marked as sent. Event: {event}, Payload: {args}"
-                    )
-            except BadSignature as exception:
-                logger.warning(
-                    f"JAIMINHO-EVENTS-RELAY: Event has been tampered, Event: {event}"
+                    events_by_ordering_key[ordering_key].append(event)
+
+            futures = [
+                executor.submit(
+                    _close_connection_after,
+                    self._relay_events_in_order,
+                    key_events,
+                    blocked_ordering_keys,
                 )
-                _capture_exception(exception)
+                for key_events in events_by_ordering_key.values()
+            ]
+            events = serial_events
 
-                if self.__stuck_on_error(event):
-                    self.__warn_stuck_on_error(event)
-                    return
+        # Serial events may share ordering keys with the events relayed by the workers,
+        # which must be relayed (or block their key) first
+        for future in futures:
+            key_sent_events, key_failed_events = future.result()
+            sent_count += len(key_sent_events)
+            failed_events.extend(key_failed_events)
+            if batch_size:
+                sent_events.extend(key_sent_events)
+            else:
+                for event in key_sent_events:
+                    self._acknowledge_event(event)
+
+        for event in events:
+            ordering_key = self._ordering_key(event)
+            if ordering_key in blocked_ordering_keys:
+                continue
+
+            if self._waiting_retry(event):
+                # Only events that keep order are fetched before their next attempt,
+                # and they hold back the events behind them
+                self.__warn_waiting_retry(event)
+                if ordering_key is not None:
+                    blocked_ordering_keys.add(ordering_key)
+                    continue
+                stuck = True
+                break
+
+            relayed = self._relay_event(event, leased)
+            if relayed:
+                sent_count += 1
+                if batch_size:
+                    sent_events.append(event)
+                else:
+                    self._acknowledge_event(event)
+                continue
+
+            if relayed is None:
+                # The circuit of the event's function is open or the lease of the event
+                # expired, so the event wasn't tried
+                if not self.__stuck_on_error(event):
+                    continue
+                self.__warn_circuit_open(event)
+            else:
+                failed_events.append(event)
+                if not self.__stuck_on_error(event):
+                    continue
+                self.__warn_stuck_on_error(event)
 
-            except (ModuleNotFoundError, AttributeError) as e:
-                logger.warning(
-                    f"JAIMINHO-EVENTS-RELAY: Function does not exist anymore, Event: {event} | Error: {str(e)}"
+            if ordering_key is not None:
+                blocked_ordering_keys.add(ordering_key)
+                continue
+            stuck = True
+            break
+
+        if sent_events:
+            self._acknowledge_events(sent_events)
+
+        if unordered_futures:
+            completed_sent_count, completed_failed_events = (
+                self._acknowledge_completed_events(
+                    unordered_futures, batch_size or DEFAULT_ACKNOWLEDGE_BATCH_SIZE
                 )
-                _capture_exception(e)
+            )
+            sent_count += completed_sent_count
+            failed_events.extend(completed_failed_events)
+
+        self._record_failures(failed_events)
+
+        return sent_count, stuck
+
+    def _acknowledge_completed_events(self, futures_events, batch_size):
+        # Sent events are acknowledged in bulk as their publishing completes
+        sent_count = 0
+        sent_events = []
+        failed_events = []
+        for future in as_completed(futures_events):
+            relayed = future.result()
+            if relayed is None:
+                continue
+            if not relayed:
+                failed_events.append(futures_events[future])
+                continue
+            sent_count += 1
+            sent_events.append(futures_events[future])
+            if len(sent_events) >= batch_size:
+                self._acknowledge_events(sent_events)
+                sent_events = []
+
+        if sent_events:
+            self._acknowledge_events(sent_events)
+
+        return sent_count, failed_events
 
-                if self.__stuck_on_error(event):
+    def _relay_events_in_order(self, events, blocked_ordering_keys):
+        sent_events = []
+        failed_events = []
+
+        for event in events:
+            if event.ordering_key in blocked_ordering_keys:
+                break
+
+            if self._waiting_retry(event):
+                self.__warn_waiting_retry(event)
+                blocked_ordering_keys.add(event.ordering_key)
+                break
+
+            relayed = self._relay_event(event)
+            if not relayed:
+                if relayed is None:
+                    self.__warn_circuit_open(event)
+                else:
                     self.__warn_stuck_on_error(event)
-                    return
+                    failed_events.append(event)
+                blocked_ordering_keys.add(event.ordering_key)
+                break
+
+            sent_events.append(event)
+
+        return sent_events, failed_events
+
+    def _waiting_retry(self, event):
+        return (
+            event.next_attempt_at is not None and event.next_attempt_at > timezone.now()
+        )
+
+    def _record_failure(self, event, exception):
+        # Only updates the event in memory, since it can run in worker threads
+        event.attempts += 1
+        event.last_error = f"{type(exception).__name__}: {exception}"
+        event.next_attempt_at = timezone.now() + backoff_delay(event.attempts)
+        # Events that keep order are retried forever, since giving up on them
+        # would relay the events behind them out of order
+        if (
+            settings.max_attempts
+            and event.attempts >= settings.max_attempts
+            and not self.__stuck_on_error(event)
+        ):
+            event.dead_at = timezone.now()
+            event.next_attempt_at = None
+
+    def _record_failures(self, events):
+        for event in events:
+            Event.objects.filter(pk=event.pk).update(
+                attempts=event.attempts,
+                last_error=event.last_error,
+                next_attempt_at=event.next_attempt_at,
+                dead_at=event.dead_at,
+            )
+
+        dead_events = [event for event in events if event.dead_at is not None]
+        for event in dead_events:
+            logger.warning(
+                f"JAIMINHO-EVENTS-RELAY: Event is dead after {event.attempts} attempts, "
+                f"it won't be relayed until requeued. Event: {event} | Error: {event.last_error}"
+            )
+        if len(events) > len(dead_events):
+            logger.info(
+                f"JAIMINHO-EVENTS-RELAY: {len(events) - len(dead_events)} failed events scheduled to be retried"
+            )
 
-            except BaseException as e:
-                logger.warning(
-                    f"JAIMINHO-EVENTS-RELAY: An error occurred when relaying event: {event} | Error: {str(e)}"
+    def _ordering_key(self, event):
+        if event.ordering_key is None or not self.__stuck_on_error(event):
+            return None
+        return event.ordering_key
+
+    def _fetch_events(self, stream, batch_size, max_events):
+        events_qs = Event.objects.select_for_update(skip_locked=True).filter(
+            sent_at__isnull=True, dead_at__isnull=True
+        )
+        events_qs = events_qs.filter(stream=stream)
+        # Events that keep order are fetched even before their next attempt, to hold back the following ones
+        events_qs = events_qs.filter(
+            _due_events_q(timezone.now()) | _ordered_events_q()
+        )
+        events_qs = events_qs.order_by("created_at", "id")
+
+        if not batch_size:
+            yield list(events_qs[:max_events] if max_events else events_qs)
+            return
+
+        remaining = max_events
+        last_event = None
+        while remaining is None or remaining > 0:
+            page_size = batch_size if remaining is None else min(batch_size, remaining)
+            page_qs = events_qs
+            if last_event is not None:
+                page_qs = page_qs.filter(
+                    Q(created_at__gt=last_event.created_at)
+                    | Q(created_at=last_event.created_at, id__gt=last_event.id)
+                )
+
+            events = list(page_qs[:page_size])
+            if events:
+                yield events
+
+            if len(events) < page_size:
+                return
+
+            if remaining is not None:
+                remaining -= len(events)
+            last_event = events[-1]
+
+    def _claim_events(self, stream, batch_size, max_events, lease_duration, worker_id):
+        # Rows are only locked while claiming, publishing happens after the claim commits.
+        # Failed events keep their lease until it expires, then any relay can claim them again.
+        events_qs = Event.objects.filter(
+            sent_at__isnull=True, dead_at__isnull=True, stream=stream
+        )
+        events_qs = events_qs.exclude(_ordered_events_q())
+
+        remaining = max_events
+        while remaining is None or remaining > 0:
+            page_size = batch_size if remaining is None else min(batch_size, remaining)
+
+            now = timezone.now()
+            with transaction.atomic():
+                claimable_qs = events_qs.filter(
+                    Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lte=now)
+                ).filter(_due_events_q(now))
+                claimable_qs = claimable_qs.select_for_update(skip_locked=True)
+                claimable_qs = claimable_qs.order_by("created_at", "id")[:page_size]
+                event_ids = list(claimable_qs.values_list("id", flat=True))
+                Event.objects.filter(id__in=event_ids).update(
+                    claimed_by=worker_id,
+                    lease_expires_at=now + timedelta(seconds=lease_duration),
+                )
+
+            if not event_ids:
+                return
+
+            logger.info(
+                f"JAIMINHO-EVENTS-RELAY: {len(event_ids)} events claimed by {worker_id}"
+            )
+            yield list(
+                Event.objects.filter(id__in=event_ids, claimed_by=worker_id).order_by(
+                    "created_at", "id"
                 )
-                original_fn = _extract_original_func(event)
+            )
+
+            if len(event_ids) < page_size:
+                return
+
+            if remaining is not None:
+                remaining -= len(event_ids)
+
+    def _relay_event(self, event, leased=False):
+        # Returns None when the circuit of the event's function is open or the lease
+        # of the event expired, without trying it
+        circuit_breaker = self._circuit_breaker(event)
+        if circuit_breaker and not circuit_breaker.allow():
+            return None
+
+        rate_limit_delay = self._reserve_rate_limit(event)
+        if rate_limit_delay:
+            sleep(rate_limit_delay)
+
+        if leased and self._lease_expired(event, circuit_breaker):
+            return None
+
+        event_payload = {}
+
+        try:
+            original_fn, args, kwargs, event_payload = self._load_event(event)
+            call_publisher(original_fn, args, kwargs)
+            logger.info(f"JAIMINHO-EVENTS-RELAY: Event sent. Event {event}")
+        except BaseException as e:
+            self._record_failure(event, e)
+            publisher_failed = self._handle_relay_error(event, e)
+            if publisher_failed:
                 event_failed_to_publish_by_events_relay.send(
-                    sender=original_fn, event_payload=event_payload
+                    sender=self._extract_original_func(event),
+                    event_payload=event_payload,
                 )
-                _capture_exception(e)
+            self._record_circuit_result(event, circuit_breaker, publisher_failed)
+            _capture_exception(e)
+            return False
 
-                if self.__stuck_on_error(event):
-                    self.__warn_stuck_on_error(event)
-                    return
-            else:
-                event_published_by_events_relay.send(
-                    sender=original_fn, event_payload=event_payload
+        if circuit_breaker:
+            circuit_breaker.record_success()
+        event_published_by_events_relay.send(
+            sender=original_fn, event_payload=event_payload
+        )
+        return True
+
+    def _lease_expired(self, event, circuit_breaker):
+        # Once the lease expires, another relay may have claimed the event again
+        if event.lease_expires_at > timezone.now():
+            return False
+        if circuit_breaker:
+            circuit_breaker.release()
+        logger.warning(
+            f"JAIMINHO-EVENTS-RELAY: Lease expired before the event was published, "
+            f"leaving it to the next claim. Event: {event}"
+        )
+        return True
+
+    def _configure_rate_limiter(
+        self, stream, events_per_second=None, bytes_per_second=None
+    ):
+        # Limits given to relay take precedence over the RATE_LIMITS setting. The limiter
+        # of each stream is kept between calls, so the loop mode doesn't start every
+        # iteration with a full bucket.
+        stream_limits = settings.rate_limits.get(stream, {})
+        limits = (
+            events_per_second or stream_limits.get("events_per_second"),
+            bytes_per_second or stream_limits.get("bytes_per_second"),
+        )
+        with self._rate_limiters_lock:
+            if not any(limits):
+                self._rate_limiters.pop(stream, None)
+            elif (
+                stream not in self._rate_limiters
+                or self._rate_limiters[stream].limits != limits
+            ):
+                self._rate_limiters[stream] = RateLimiter(*limits)
+
+    def _reserve_rate_limit(self, event):
+        # Returns how long (in seconds) to wait before publishing the event.
+        # Bytes are measured on the stored payload, without loading the event.
+        rate_limiter = self._rate_limiters.get(event.stream)
+        if not rate_limiter:
+            return 0
+        return rate_limiter.reserve(
+            len(event.message or b"") + len(event.kwargs or b"")
+        )
+
+    def _circuit_breaker(self, event):
+        # Events are grouped by function without loading them, through the function
+        # path or a digest of the pickled function
+        if not settings.circuit_breaker_threshold:
+            return None
+
+        function = (
+            event.function_path
+            or hashlib.sha1(bytes(event.function or b"")).hexdigest()
+        )
+        with self._circuit_breakers_lock:
+            if function not in self._circuit_breakers:
+                self._circuit_breakers[function] = CircuitBreaker(
+                    settings.circuit_breaker_threshold,
+                    settings.circuit_breaker_reset_timeout,
                 )
+            return self._circuit_breakers[function]
+
+    def _record_circuit_result(self, event, circuit_breaker, publisher_failed):
+        if not circuit_breaker:
+            return
+        if not publisher_failed:
+            # Tampered events and missing functions say nothing about the publisher
+            circuit_breaker.release()
+            return
+        if circuit_breaker.record_failure():
+            logger.warning(
+                f"JAIMINHO-EVENTS-RELAY: Circuit opened after {circuit_breaker.failures} consecutive "
+                f"failures, events of the same function are skipped for "
+                f"{circuit_breaker.reset_timeout}s. Event: {event}"
+            )
+
+    def _load_event(self, event):
+        event.verify_integrity()
+        serializer = get_serializer(event.serializer)
+        args = serializer.loads_message(decompress(event.message))
+        kwargs = serializer.loads(decompress(event.kwargs)) if event.kwargs else {}
+        event_payload = get_event_payload(args)
+        original_fn = self._extract_original_func(event)
+        return original_fn, args, kwargs, event_payload
+
+    def _handle_relay_error(self, event, exception):
+        # Returns whether the publisher itself failed, which is reported through signals
+        if isinstance(exception, BadSignature):
+            logger.warning(
+                f"JAIMINHO-EVENTS-RELAY: Event has been tampered, Event: {event}"
+            )
+            return False
+
+        if isinstance(exception, (ModuleNotFoundError, AttributeError)):
+            logger.warning(
+                f"JAIMINHO-EVENTS-RELAY: Function does not exist anymore, Event: {event} | Error: {str(exception)}"
+            )
+            return False
+
+        logger.warning(
+            f"JAIMINHO-EVENTS-RELAY: An error occurred when relaying event: {event} | Error: {str(exception)}"
+        )
+        return True
+
+    def _extract_original_func(self, event):
+        if event.function_path:
+            return resolve_function_reference(event.function_path)
+
+        fn = self._load_function(bytes(event.function))
+        original_fn = getattr(fn, "original_func", fn)
+        return original_fn
+
+    def _acknowledge_event(self, event):
+        if settings.delete_after_send:
+            event.delete()
+            logger.info(
+                f"JAIMINHO-EVENTS-RELAY: Event deleted after success send. Event: {event}"
+            )
+        elif settings.archive_sent_events:
+            event.archive()
+            logger.info(f"JAIMINHO-EVENTS-RELAY: Event archived. Event: {event}")
+        else:
+            event.mark_as_sent()
+            logger.info(f"JAIMINHO-EVENTS-RELAY: Event marked as sent. Event: {event}")
+
+    def _acknowledge_events(self, events):
+        events_qs = Event.objects.filter(id__in=[event.id for event in events])
+
+        if settings.delete_after_send:
+            events_qs.delete()
+            logger.info(
+                f"JAIMINHO-EVENTS-RELAY: {len(events)} events deleted after success send."
+            )
+        elif settings.archive_sent_events:
+            events_qs.archive()
+            logger.info(f"JAIMINHO-EVENTS-RELAY: {len(events)} events archived.")
+        else:
+            events_qs.mark_as_sent()
+            logger.info(f"JAIMINHO-EVENTS-RELAY: {len(events)} events marked as sent.")
 
     def __stuck_on_error(self, event):
         if not event.strategy:
             return settings.publish_strategy == PublishStrategyType.KEEP_ORDER
         return event.strategy == PublishStrategyType.KEEP_ORDER
 
+    def __warn_waiting_retry(self, event):
+        logger.warning(
+            f"JAIMINHO-EVENTS-RELAY: Events relaying are waiting for the retry of Event: {event} "
+            f"at {event.next_attempt_at}"
+        )
+
+    def __warn_circuit_open(self, event):
+        logger.warning(
+            f"JAIMINHO-EVENTS-RELAY: Events relaying are waiting for the circuit of Event: {event} "
+            f"to close"
+        )
+
     def __warn_stuck_on_error(self, event):
         logger.warning(
             f"JAIMINHO-EVENTS-RELAY: Events relaying are stuck due to failing Event: {event}"
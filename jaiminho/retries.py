@@ -0,0 +1,13 @@
+import random
+from datetime import timedelta
+
+from jaiminho import settings
+
+
+def backoff_delay(attempts):
+    # Exponential backoff with jitter, so failed events don't retry in lockstep
+    delay = min(
+        settings.retry_backoff_max,
+        settings.retry_backoff_base * 2 ** max(attempts - 1, 0),
+    )
+    return timedelta(seconds=delay * random.uniform(0.5, 1))
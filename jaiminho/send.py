@@ -1,6 +1,8 @@
 import logging
 from functools import wraps
 
+from jaiminho.registry import register_function
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,10 +17,11 @@ def save_to_outbox(func):
         publish_strategy.publish(args, kwargs, func)
 
     inner.original_func = func
+    register_function(func)
     return inner
 
 
-def save_to_outbox_stream(stream, overwrite_strategy_with=None):
+def save_to_outbox_stream(stream, overwrite_strategy_with=None, ordering_key=None):
     def decorator(func):
         @wraps(func)
         def inner(*args, **kwargs):
@@ -31,10 +34,14 @@ def save_to_outbox_stream(stream, overwrite_strategy_with=None):
                 if overwrite_strategy_with
                 else settings.publish_strategy
             )
+            _ordering_key = str(ordering_key(*args, **kwargs)) if ordering_key else None
             publish_strategy = create_publish_strategy(_publish_strategy)
-            publish_strategy.publish(args, kwargs, func, stream)
+            publish_strategy.publish(
+                args, kwargs, func, stream, ordering_key=_ordering_key
+            )
 
         inner.original_func = func
+        register_function(func)
         return inner
 
     return decorator
@@ -0,0 +1,104 @@
+import json
+import pickle
+from abc import ABC, abstractmethod
+
+import dill
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+class BaseSerializer(ABC):
+    name = None
+    # Whether loading a payload always gives back the same types that were dumped
+    preserves_types = True
+
+    @abstractmethod
+    def dumps(self, value):
+        raise NotImplementedError
+
+    @abstractmethod
+    def loads(self, data):
+        raise NotImplementedError
+
+    def loads_message(self, data):
+        return self.loads(data)
+
+
+class DillSerializer(BaseSerializer):
+    name = "dill"
+
+    def dumps(self, value):
+        return dill.dumps(value)
+
+    def loads(self, data):
+        return dill.loads(data)
+
+
+class PickleSerializer(BaseSerializer):
+    name = "pickle"
+
+    def dumps(self, value):
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data):
+        return pickle.loads(data)
+
+
+class JSONSerializer(BaseSerializer):
+    name = "json"
+    preserves_types = False
+
+    def dumps(self, value):
+        return json.dumps(value, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+
+    def loads(self, data):
+        return json.loads(bytes(data))
+
+    def loads_message(self, data):
+        # Messages are always saved as a tuple of args, which JSON turns into a list
+        return tuple(self.loads(data))
+
+
+class MsgpackSerializer(BaseSerializer):
+    name = "msgpack"
+    preserves_types = False
+
+    def __init__(self):
+        if msgpack is None:
+            raise ValueError("msgpack serializer requires the msgpack package")
+
+    def dumps(self, value):
+        return msgpack.packb(value)
+
+    def loads(self, data):
+        return msgpack.unpackb(bytes(data))
+
+    def loads_message(self, data):
+        # Messages are always saved as a tuple of args, which msgpack turns into a list
+        return tuple(self.loads(data))
+
+
+SERIALIZERS = {
+    serializer.name: serializer
+    for serializer in (
+        DillSerializer,
+        PickleSerializer,
+        JSONSerializer,
+        MsgpackSerializer,
+    )
+}
+
+
+def get_serializer(name):
+    # Events saved before serializers were configurable were pickled with dill
+    if name is None:
+        name = DillSerializer.name
+
+    try:
+        return SERIALIZERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown serializer: {name}")
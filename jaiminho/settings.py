@@ -21,3 +21,22 @@ default_capture_exception = jaiminho_settings.get(
 )
 sign_events = jaiminho_settings.get("SIGN_EVENTS", True)
 verify_events_signature = jaiminho_settings.get("VERIFY_EVENTS_SIGNATURE", True)
+function_cache_size = jaiminho_settings.get("FUNCTION_CACHE_SIZE", 128)
+store_function_reference = jaiminho_settings.get("STORE_FUNCTION_REFERENCE", False)
+serializer = jaiminho_settings.get("SERIALIZER", "dill")
+compression = jaiminho_settings.get("COMPRESSION", None)
+compression_threshold = jaiminho_settings.get("COMPRESSION_THRESHOLD", 1024)
+stream_compression = jaiminho_settings.get("STREAM_COMPRESSION", {})
+coalesce_on_commit_hooks = jaiminho_settings.get("COALESCE_ON_COMMIT_HOOKS", False)
+partition_interval = jaiminho_settings.get("PARTITION_INTERVAL", "daily")
+archive_sent_events = jaiminho_settings.get("ARCHIVE_SENT_EVENTS", False)
+notify_on_insert = jaiminho_settings.get("NOTIFY_ON_INSERT", False)
+notify_channel = jaiminho_settings.get("NOTIFY_CHANNEL", "jaiminho_events")
+retry_backoff_base = jaiminho_settings.get("RETRY_BACKOFF_BASE", 1)
+retry_backoff_max = jaiminho_settings.get("RETRY_BACKOFF_MAX", 300)
+max_attempts = jaiminho_settings.get("MAX_ATTEMPTS", None)
+circuit_breaker_threshold = jaiminho_settings.get("CIRCUIT_BREAKER_THRESHOLD", None)
+circuit_breaker_reset_timeout = jaiminho_settings.get(
+    "CIRCUIT_BREAKER_RESET_TIMEOUT", 30
+)
+rate_limits = jaiminho_settings.get("RATE_LIMITS", {})
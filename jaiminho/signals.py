@@ -4,6 +4,7 @@ event_published = dispatch.Signal()
 event_failed_to_publish = dispatch.Signal()
 event_published_by_events_relay = dispatch.Signal()
 event_failed_to_publish_by_events_relay = dispatch.Signal()
+events_relay_iteration_finished = dispatch.Signal()
 
 
 def get_event_payload(args):
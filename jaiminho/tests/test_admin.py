@@ -1,7 +1,9 @@
-from jaiminho.admin import EventAdmin
-from jaiminho.models import Event
+from django.contrib import admin
 from django.contrib.admin import AdminSite
 
+from jaiminho.admin import EventAdmin
+from jaiminho.models import Event, EventArchive
+
 
 class TestEventAdmin:
     def test_has_add_permission(self):
@@ -39,3 +41,6 @@ class TestEventAdmin:
             "strategy",
             "created_at",
         )
+
+    def test_archived_events_share_the_admin(self):
+        assert isinstance(admin.site._registry[EventArchive], EventAdmin)
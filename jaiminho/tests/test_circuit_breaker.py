@@ -0,0 +1,71 @@
+import pytest
+
+from jaiminho.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+@pytest.fixture
+def mock_monotonic(mocker):
+    return mocker.patch("jaiminho.circuit_breaker.monotonic", return_value=100)
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self, mock_monotonic):
+        circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+
+        assert circuit_breaker.record_failure() is False
+        assert circuit_breaker.allow()
+        assert circuit_breaker.record_failure() is True
+
+        assert circuit_breaker.state == OPEN
+        assert not circuit_breaker.allow()
+
+    def test_success_resets_failures(self, mock_monotonic):
+        circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+
+        circuit_breaker.record_failure()
+        circuit_breaker.record_success()
+        circuit_breaker.record_failure()
+
+        assert circuit_breaker.state == CLOSED
+
+    def test_half_opens_after_reset_timeout(self, mock_monotonic):
+        circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        circuit_breaker.record_failure()
+
+        mock_monotonic.return_value = 130
+
+        assert circuit_breaker.state == HALF_OPEN
+        assert circuit_breaker.allow()
+        # A single trial call at a time
+        assert not circuit_breaker.allow()
+
+    def test_closes_after_successful_trial(self, mock_monotonic):
+        circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        circuit_breaker.record_failure()
+        mock_monotonic.return_value = 130
+        circuit_breaker.allow()
+
+        circuit_breaker.record_success()
+
+        assert circuit_breaker.stats() == {"state": CLOSED, "failures": 0}
+
+    def test_opens_again_after_failed_trial(self, mock_monotonic):
+        circuit_breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+        for _ in range(3):
+            circuit_breaker.record_failure()
+        mock_monotonic.return_value = 130
+        circuit_breaker.allow()
+
+        assert circuit_breaker.record_failure() is True
+
+        assert circuit_breaker.state == OPEN
+
+    def test_release_allows_another_trial(self, mock_monotonic):
+        circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        circuit_breaker.record_failure()
+        mock_monotonic.return_value = 130
+        circuit_breaker.allow()
+
+        circuit_breaker.release()
+
+        assert circuit_breaker.allow()
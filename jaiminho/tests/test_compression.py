@@ -0,0 +1,52 @@
+import zlib
+
+import pytest
+
+from jaiminho.compression import compress, decompress
+
+
+class TestCompression:
+    PAYLOAD = b"\x80\x04" + b"compressible payload " * 100
+
+    def test_compress_round_trip(self):
+        compressed = compress(self.PAYLOAD, "zlib")
+
+        assert compressed[:2] == b"\x00\x01"
+        assert len(compressed) < len(self.PAYLOAD)
+        assert decompress(compressed) == self.PAYLOAD
+
+    def test_zstd_compress_round_trip(self):
+        pytest.importorskip("zstandard")
+        compressed = compress(self.PAYLOAD, "zstd")
+
+        assert compressed[:2] == b"\x00\x02"
+        assert decompress(compressed) == self.PAYLOAD
+
+    def test_does_not_compress_without_codec(self):
+        assert compress(self.PAYLOAD, None) == self.PAYLOAD
+
+    def test_does_not_compress_payloads_smaller_than_threshold(self):
+        assert compress(self.PAYLOAD, "zlib", threshold=10000) == self.PAYLOAD
+
+    def test_does_not_compress_when_it_does_not_save_space(self):
+        payload = b"\x80\x04abc"
+
+        assert compress(payload, "zlib") == payload
+
+    def test_does_not_compress_none(self):
+        assert compress(None, "zlib") is None
+
+    def test_decompress_uncompressed_payload(self):
+        assert decompress(self.PAYLOAD) == self.PAYLOAD
+
+    def test_decompress_memoryview(self):
+        compressed = memoryview(b"\x00\x01" + zlib.compress(self.PAYLOAD))
+
+        assert decompress(compressed) == self.PAYLOAD
+
+    def test_unknown_codec(self):
+        with pytest.raises(ValueError):
+            compress(self.PAYLOAD, "lz4")
+
+        with pytest.raises(ValueError):
+            decompress(b"\x00\x09" + self.PAYLOAD)
@@ -0,0 +1,43 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+
+from jaiminho.coroutines import acall_publisher, call_publisher
+
+
+async def async_publisher(payload, **kwargs):
+    await asyncio.sleep(0)
+    return payload, kwargs
+
+
+def sync_publisher(payload, **kwargs):
+    return payload, kwargs
+
+
+class TestCallPublisher:
+    def test_calls_sync_publisher(self):
+        assert call_publisher(sync_publisher, ({"a": 1},), {"b": 2}) == (
+            {"a": 1},
+            {"b": 2},
+        )
+
+    def test_runs_coroutine_publisher(self):
+        assert call_publisher(async_publisher, ({"a": 1},), {}) == ({"a": 1}, {})
+
+    def test_passes_non_tuple_args_as_single_argument(self):
+        assert call_publisher(sync_publisher, {"a": 1}, {}) == ({"a": 1}, {})
+
+
+class TestAsyncCallPublisher:
+    def test_awaits_coroutine_publisher(self):
+        assert async_to_sync(acall_publisher)(async_publisher, ({"a": 1},), {}) == (
+            {"a": 1},
+            {},
+        )
+
+    def test_runs_sync_publisher_in_thread(self):
+        publisher = mock.Mock(return_value="sent")
+
+        assert async_to_sync(acall_publisher)(publisher, ({"a": 1},), {}) == "sent"
+        publisher.assert_called_once_with({"a": 1})
@@ -0,0 +1,67 @@
+import pytest
+from django.db import models
+
+from jaiminho.migration_operations import (
+    AddOutboxIndex,
+    RemoveOutboxIndex,
+    is_table_partitioned,
+)
+from jaiminho.models import Event
+
+INDEX = models.Index(fields=["stream"], name="jaiminho_event_test_idx")
+
+
+@pytest.fixture
+def schema_editor(mocker):
+    schema_editor = mocker.MagicMock()
+    schema_editor.connection.vendor = "postgresql"
+    return schema_editor
+
+
+class TestOutboxIndexOperations:
+    @pytest.mark.parametrize(
+        "vendor,partitioned,concurrently",
+        (
+            ("postgresql", False, True),
+            ("postgresql", True, False),
+            ("sqlite", False, False),
+        ),
+    )
+    def test_add_index_concurrently_when_supported(
+        self, mocker, schema_editor, vendor, partitioned, concurrently
+    ):
+        schema_editor.connection.vendor = vendor
+        mocker.patch(
+            "jaiminho.migration_operations.is_table_partitioned",
+            return_value=partitioned,
+        )
+        operation = AddOutboxIndex(model_name="event", index=INDEX)
+
+        operation._add_index(schema_editor, Event, INDEX)
+
+        if concurrently:
+            schema_editor.add_index.assert_called_once_with(
+                Event, INDEX, concurrently=True
+            )
+        else:
+            schema_editor.add_index.assert_called_once_with(Event, INDEX)
+
+    def test_remove_index_concurrently(self, mocker, schema_editor):
+        mocker.patch(
+            "jaiminho.migration_operations.is_table_partitioned", return_value=False
+        )
+        operation = RemoveOutboxIndex(model_name="event", name=INDEX.name)
+
+        operation._remove_index(schema_editor, Event, INDEX)
+
+        schema_editor.remove_index.assert_called_once_with(
+            Event, INDEX, concurrently=True
+        )
+
+    @pytest.mark.parametrize("row,partitioned", (((1,), True), (None, False)))
+    def test_is_table_partitioned(self, mocker, row, partitioned):
+        cursor = mocker.MagicMock()
+        cursor.fetchone.return_value = row
+
+        assert is_table_partitioned(cursor, "jaiminho_event") is partitioned
+        assert cursor.execute.call_args.args[1] == ["jaiminho_event"]
@@ -6,7 +6,7 @@ from freezegun import freeze_time
 
 from django.core.signing import BadSignature
 from jaiminho.tests.factories import EventFactory
-from jaiminho.models import Event
+from jaiminho.models import Event, EventArchive
 
 
 @pytest.mark.django_db
@@ -19,6 +19,30 @@ class TestEvent:
             event.mark_as_sent()
             assert event.sent_at == datetime(2022, 1, 1, tzinfo=UTC)
 
+        event.refresh_from_db()
+        assert event.sent_at == datetime(2022, 1, 1, tzinfo=UTC)
+
+    def test_mark_as_sent_only_updates_sent_at(self, mocker):
+        event = EventFactory(message=b"message")
+        Event.objects.filter(pk=event.pk).update(message=b"changed")
+        generate_event_signature = mocker.spy(Event, "_generate_event_signature")
+
+        event.mark_as_sent()
+
+        generate_event_signature.assert_not_called()
+        event.refresh_from_db()
+        assert event.sent_at is not None
+        assert bytes(event.message) == b"changed"
+
+    def test_save_signs_updated_payload_fields(self):
+        event = EventFactory(message=b"message")
+
+        event.message = b"changed"
+        event.save(update_fields=["message"])
+
+        event.refresh_from_db()
+        event.verify_integrity()
+
     @pytest.mark.parametrize(
         "payload,expected_signature",
         [
@@ -129,3 +153,42 @@ class TestEvent:
         event = EventFactory.create(message=b"message")
 
         assert event.signature is None
+
+    def test_bulk_create_signs_events(self):
+        Event.objects.bulk_create(
+            [Event(message=b"message"), Event(message=b"message", kwargs=b"kwargs")]
+        )
+
+        signatures = [event.signature for event in Event.objects.order_by("id")]
+        assert signatures == [
+            "ME8-7L8XjJPI7rs5w1pJtnpolu31c6vQ-EzlXwCBIdc",
+            "nG77dEJNI5I7ScNS4caN53j9nMl46Y74gwYo2mHAk8Y",
+        ]
+
+
+@pytest.mark.django_db
+class TestEventArchive:
+    def test_archive_moves_events_to_archive_table(self):
+        events = EventFactory.create_batch(2, stream="my-stream", ordering_key="key")
+        remaining_event = EventFactory()
+
+        with freeze_time("2022-01-01"):
+            Event.objects.filter(id__in=[event.id for event in events]).archive()
+
+        assert list(Event.objects.all()) == [remaining_event]
+        for event in events:
+            archived_event = EventArchive.objects.get(id=event.id)
+            assert archived_event.sent_at == datetime(2022, 1, 1, tzinfo=UTC)
+            assert bytes(archived_event.message) == bytes(event.message)
+            assert archived_event.signature == event.signature
+            assert archived_event.created_at == event.created_at
+            assert archived_event.stream == "my-stream"
+            assert archived_event.ordering_key == "key"
+
+    def test_archive_single_event(self):
+        event = EventFactory()
+
+        event.archive()
+
+        assert not Event.objects.exists()
+        assert EventArchive.objects.filter(id=event.id).exists()
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import pytest
+from django.db import NotSupportedError
+
+from jaiminho.notifications import EventNotificationListener, notify_event_created
+
+
+class FakePsycopg2Connection:
+    def __init__(self, payloads):
+        self.notifies = []
+        self.pending = list(payloads)
+
+    def poll(self):
+        if self.pending:
+            self.notifies.append(SimpleNamespace(payload=self.pending.pop(0)))
+
+
+class FakePsycopg3Connection:
+    def __init__(self, payloads):
+        self.payloads = list(payloads)
+
+    def notifies(self, timeout=None, stop_after=None):
+        if self.payloads:
+            yield SimpleNamespace(payload=self.payloads.pop(0))
+
+
+@pytest.fixture
+def postgresql_connection(mocker):
+    connection = mocker.MagicMock(vendor="postgresql")
+    connection.ops.quote_name = lambda name: f'"{name}"'
+    mocker.patch("jaiminho.notifications.connections", {"default": connection})
+    return connection
+
+
+class TestNotifyEventCreated:
+    def test_does_not_notify_by_default(self, postgresql_connection):
+        notify_event_created("my-stream")
+
+        postgresql_connection.cursor.assert_not_called()
+
+    def test_notifies_stream(self, mocker, postgresql_connection):
+        mocker.patch("jaiminho.settings.notify_on_insert", True)
+
+        notify_event_created("my-stream")
+
+        cursor = postgresql_connection.cursor.return_value.__enter__.return_value
+        cursor.execute.assert_called_once_with(
+            "SELECT pg_notify(%s, %s)", ["jaiminho_events", "my-stream"]
+        )
+
+    @pytest.mark.django_db
+    def test_does_not_notify_on_other_databases(self, mocker):
+        mocker.patch("jaiminho.settings.notify_on_insert", True)
+
+        notify_event_created("my-stream")
+
+
+class TestEventNotificationListener:
+    @pytest.mark.django_db
+    def test_requires_postgresql(self):
+        with pytest.raises(NotSupportedError):
+            EventNotificationListener()
+
+    @pytest.mark.parametrize(
+        "raw_connection_class", (FakePsycopg2Connection, FakePsycopg3Connection)
+    )
+    def test_wait_returns_when_stream_is_notified(
+        self, mocker, postgresql_connection, raw_connection_class
+    ):
+        mocker.patch("jaiminho.notifications.select.select")
+        postgresql_connection.connection = raw_connection_class(
+            ["other-stream", "my-stream"]
+        )
+        listener = EventNotificationListener()
+
+        assert listener.wait(10, stream="my-stream") is True
+
+        cursor = postgresql_connection.cursor.return_value.__enter__.return_value
+        cursor.execute.assert_called_once_with('LISTEN "jaiminho_events"')
+
+    def test_wait_times_out_without_notifications(self, mocker, postgresql_connection):
+        mocker.patch("jaiminho.notifications.select.select")
+        mocker.patch("jaiminho.notifications.monotonic", side_effect=[0, 0, 1])
+        postgresql_connection.connection = FakePsycopg2Connection([])
+
+        assert EventNotificationListener().wait(0.5) is False
+
+    def test_listens_again_after_reconnecting(self, mocker, postgresql_connection):
+        mocker.patch("jaiminho.notifications.select.select")
+        listener = EventNotificationListener()
+        postgresql_connection.connection = FakePsycopg2Connection([""])
+        listener.wait(10)
+        postgresql_connection.connection = FakePsycopg2Connection([""])
+        listener.wait(10)
+
+        cursor = postgresql_connection.cursor.return_value.__enter__.return_value
+        assert cursor.execute.call_count == 2
@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.db import NotSupportedError, OperationalError
+
+from jaiminho.partitioning import (
+    drop_expired_partitions,
+    is_partitioned,
+    parse_partition_name,
+    partition_name,
+    partition_ranges,
+    partition_start,
+)
+
+
+class TestPartitioning:
+    MOMENT = datetime(2026, 10, 15, 13, 30, tzinfo=timezone.utc)
+
+    def test_daily_partition_starts_at_midnight(self):
+        assert partition_start(self.MOMENT, "daily") == datetime(
+            2026, 10, 15, tzinfo=timezone.utc
+        )
+
+    def test_weekly_partition_starts_on_monday(self):
+        assert partition_start(self.MOMENT, "weekly") == datetime(
+            2026, 10, 12, tzinfo=timezone.utc
+        )
+
+    def test_partition_ranges_cover_the_interval(self):
+        ranges = list(
+            partition_ranges(
+                self.MOMENT, datetime(2026, 10, 17, tzinfo=timezone.utc), "daily"
+            )
+        )
+
+        assert ranges == [
+            (
+                datetime(2026, 10, 15, tzinfo=timezone.utc),
+                datetime(2026, 10, 16, tzinfo=timezone.utc),
+            ),
+            (
+                datetime(2026, 10, 16, tzinfo=timezone.utc),
+                datetime(2026, 10, 17, tzinfo=timezone.utc),
+            ),
+        ]
+
+    def test_partition_name_round_trip(self):
+        start = datetime(2026, 10, 12, tzinfo=timezone.utc)
+        end = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+        name = partition_name(start, end)
+
+        assert name == "jaiminho_event_p20261012_20261019"
+        assert parse_partition_name(name) == (start, end)
+
+    @pytest.mark.parametrize(
+        "name", ["jaiminho_event_default", "jaiminho_event_pfoo_bar", "other_table"]
+    )
+    def test_parse_ignores_other_tables(self, name):
+        assert parse_partition_name(name) is None
+
+    @pytest.mark.django_db
+    def test_requires_postgresql(self):
+        with pytest.raises(NotSupportedError):
+            is_partitioned()
+
+    def test_skips_partitions_that_cannot_be_locked(self, mocker, caplog):
+        mocker.patch("jaiminho.partitioning._get_connection")
+        mocker.patch(
+            "jaiminho.partitioning.list_partitions",
+            return_value=[
+                (
+                    "jaiminho_event_p20261001_20261002",
+                    datetime(2026, 10, 1, tzinfo=timezone.utc),
+                    datetime(2026, 10, 2, tzinfo=timezone.utc),
+                ),
+                (
+                    "jaiminho_event_p20261002_20261003",
+                    datetime(2026, 10, 2, tzinfo=timezone.utc),
+                    datetime(2026, 10, 3, tzinfo=timezone.utc),
+                ),
+            ],
+        )
+        mocker.patch(
+            "jaiminho.partitioning._drop_partition",
+            side_effect=[
+                OperationalError("canceling statement due to lock timeout"),
+                True,
+            ],
+        )
+
+        dropped = drop_expired_partitions(self.MOMENT)
+
+        assert dropped == ["jaiminho_event_p20261002_20261003"]
+        assert (
+            "Skipping partition jaiminho_event_p20261001_20261002, it could not be dropped: "
+            "canceling statement due to lock timeout" in caplog.text
+        )
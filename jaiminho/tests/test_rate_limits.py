@@ -0,0 +1,53 @@
+import pytest
+
+from jaiminho.rate_limits import RateLimiter, TokenBucket
+
+
+@pytest.fixture
+def mock_monotonic(mocker):
+    return mocker.patch("jaiminho.rate_limits.monotonic", return_value=100)
+
+
+class TestTokenBucket:
+    def test_starts_full(self, mock_monotonic):
+        bucket = TokenBucket(rate=2)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0.5
+
+    def test_refills_over_time(self, mock_monotonic):
+        bucket = TokenBucket(rate=2)
+        bucket.reserve(2)
+
+        mock_monotonic.return_value = 100.5
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0.5
+
+    def test_does_not_refill_beyond_capacity(self, mock_monotonic):
+        bucket = TokenBucket(rate=2, capacity=3)
+
+        mock_monotonic.return_value = 200
+
+        assert bucket.reserve(3) == 0
+        assert bucket.reserve() == 0.5
+
+    def test_serves_requests_larger_than_capacity(self, mock_monotonic):
+        bucket = TokenBucket(rate=10)
+
+        assert bucket.reserve(30) == 2
+
+
+class TestRateLimiter:
+    def test_waits_for_the_slowest_bucket(self, mock_monotonic):
+        rate_limiter = RateLimiter(events_per_second=1, bytes_per_second=100)
+
+        assert rate_limiter.reserve(100) == 0
+        assert rate_limiter.reserve(300) == 3
+
+    def test_limits_only_events(self, mock_monotonic):
+        rate_limiter = RateLimiter(events_per_second=1)
+
+        assert rate_limiter.reserve(10**9) == 0
+        assert rate_limiter.reserve(0) == 1
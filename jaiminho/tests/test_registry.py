@@ -0,0 +1,53 @@
+import pytest
+
+from jaiminho.registry import (
+    get_function_reference,
+    register_function,
+    resolve_function_reference,
+)
+from jaiminho.tests.utils import foo
+from jaiminho_django_test_project.send import ExampleClass, notify
+
+
+class TestRegistry:
+    def test_get_reference_of_decorated_function(self):
+        assert (
+            get_function_reference(notify.original_func)
+            == "jaiminho_django_test_project.send:notify"
+        )
+
+    def test_get_reference_of_decorated_method(self):
+        assert (
+            get_function_reference(ExampleClass.notify.original_func)
+            == "jaiminho_django_test_project.send:ExampleClass.notify"
+        )
+
+    def test_get_reference_of_not_registered_function(self):
+        assert get_function_reference(foo) is None
+
+    def test_functions_defined_inside_functions_are_not_registered(self):
+        def local_function():
+            pass
+
+        register_function(local_function)
+
+        assert get_function_reference(local_function) is None
+
+    def test_resolve_registered_function(self):
+        assert (
+            resolve_function_reference("jaiminho_django_test_project.send:notify")
+            is notify.original_func
+        )
+
+    def test_resolve_not_registered_function_through_import(self):
+        assert resolve_function_reference("jaiminho.tests.utils:foo") is foo
+
+    def test_resolve_missing_module(self):
+        with pytest.raises(ModuleNotFoundError):
+            resolve_function_reference("jaiminho_django_test_project.send2:notify")
+
+    def test_resolve_missing_function(self):
+        with pytest.raises(AttributeError):
+            resolve_function_reference(
+                "jaiminho_django_test_project.send:never_existed"
+            )
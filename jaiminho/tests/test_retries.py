@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+import pytest
+
+from jaiminho.retries import backoff_delay
+
+
+class TestBackoffDelay:
+    @pytest.mark.parametrize(
+        "attempts,expected_delay", ((1, 1), (2, 2), (3, 4), (6, 32), (20, 300))
+    )
+    def test_grows_exponentially_up_to_max(self, mocker, attempts, expected_delay):
+        mocker.patch("jaiminho.retries.random.uniform", return_value=1)
+
+        assert backoff_delay(attempts) == timedelta(seconds=expected_delay)
+
+    def test_adds_jitter(self, mocker):
+        mocker.patch("jaiminho.settings.retry_backoff_base", 10)
+        uniform = mocker.patch("jaiminho.retries.random.uniform", return_value=0.75)
+
+        assert backoff_delay(2) == timedelta(seconds=15)
+        uniform.assert_called_once_with(0.5, 1)
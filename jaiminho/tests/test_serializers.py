@@ -0,0 +1,66 @@
+import pytest
+
+from jaiminho.serializers import (
+    DillSerializer,
+    JSONSerializer,
+    MsgpackSerializer,
+    PickleSerializer,
+    get_serializer,
+)
+
+
+class TestSerializers:
+    @pytest.mark.parametrize(
+        "serializer", (DillSerializer(), PickleSerializer(), JSONSerializer())
+    )
+    def test_round_trip(self, serializer):
+        payload = {"a": 1, "b": [1, 2], "c": {"d": None}}
+
+        assert serializer.loads(serializer.dumps(payload)) == payload
+
+    @pytest.mark.parametrize(
+        "serializer", (DillSerializer(), PickleSerializer(), JSONSerializer())
+    )
+    def test_messages_are_loaded_as_tuples(self, serializer):
+        message = ({"a": 1}, "b")
+
+        assert serializer.loads_message(serializer.dumps(message)) == message
+
+    @pytest.mark.parametrize(
+        "serializer,preserves_types",
+        (
+            (DillSerializer(), True),
+            (PickleSerializer(), True),
+            (JSONSerializer(), False),
+        ),
+    )
+    def test_preserves_types(self, serializer, preserves_types):
+        assert serializer.preserves_types is preserves_types
+
+    def test_json_serializer_loads_memoryview(self):
+        serializer = JSONSerializer()
+
+        assert serializer.loads(memoryview(b'{"a":1}')) == {"a": 1}
+
+    def test_msgpack_serializer_round_trip(self):
+        pytest.importorskip("msgpack")
+        serializer = MsgpackSerializer()
+        message = ({"a": 1, "b": [1, 2]},)
+
+        assert serializer.loads_message(serializer.dumps(message)) == message
+
+    @pytest.mark.parametrize(
+        "name,serializer_class",
+        (
+            (None, DillSerializer),
+            ("dill", DillSerializer),
+            ("pickle", PickleSerializer),
+            ("json", JSONSerializer),
+        ),
+    )
+    def test_get_serializer(self, name, serializer_class):
+        assert isinstance(get_serializer(name), serializer_class)
+
+    def test_get_unknown_serializer(self):
+        with pytest.raises(ValueError):
+            get_serializer("yaml")
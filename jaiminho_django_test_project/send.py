@@ -1,3 +1,4 @@
+import asyncio
 import json
 
 from jaiminho.constants import PublishStrategyType
@@ -38,12 +39,27 @@ def notify_to_stream_overwriting_strategy(*args, **kwargs):
     internal_notify(*args, **kwargs)
 
 
+@save_to_outbox_stream(
+    EXAMPLE_STREAM,
+    PublishStrategyType.KEEP_ORDER,
+    ordering_key=lambda payload, **kwargs: payload["id"],
+)
+def notify_to_stream_ordered_by_key(payload, **kwargs):
+    internal_notify(payload, **kwargs)
+
+
 @save_to_outbox_stream(EXAMPLE_STREAM, PublishStrategyType.KEEP_ORDER)
 def notify_functional_to_stream_overwriting_strategy(*args, **kwargs):
     with open(kwargs["filepath"], "w") as write_file:
         json.dump(args, write_file, indent=4)
 
 
+@save_to_outbox
+async def notify_async(*args, **kwargs):
+    await asyncio.sleep(0)
+    internal_notify(*args, **kwargs)
+
+
 def notify_without_decorator(*args, **kwargs):
     internal_notify(*args, **kwargs)
 
@@ -0,0 +1,42 @@
+from io import StringIO
+
+import dill
+import pytest
+from django.core.management import call_command
+
+from jaiminho.compression import compress
+from jaiminho.tests.factories import EventFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestEventsCompressionReportCommand:
+    PAYLOAD = dill.dumps(({"document": "compressible " * 200},))
+
+    def test_reports_compression_ratio_per_stream(self):
+        EventFactory(message=compress(self.PAYLOAD, "zlib"), stream="my-stream")
+        EventFactory(message=self.PAYLOAD)
+        out = StringIO()
+
+        call_command("events_compression_report", stdout=out)
+
+        compressed_size = len(compress(self.PAYLOAD, "zlib"))
+        ratio = len(self.PAYLOAD) / compressed_size
+        assert (
+            f"stream=my-stream events=1 stored_bytes={compressed_size} "
+            f"uncompressed_bytes={len(self.PAYLOAD)} ratio={ratio:.2f}"
+        ) in out.getvalue()
+        assert (
+            f"stream=None events=1 stored_bytes={len(self.PAYLOAD)} "
+            f"uncompressed_bytes={len(self.PAYLOAD)} ratio=1.00"
+        ) in out.getvalue()
+
+    def test_reports_only_given_stream(self):
+        EventFactory(message=compress(self.PAYLOAD, "zlib"), stream="my-stream")
+        EventFactory(message=self.PAYLOAD)
+        out = StringIO()
+
+        call_command("events_compression_report", stream="my-stream", stdout=out)
+
+        assert "stream=my-stream events=1" in out.getvalue()
+        assert "stream=None" not in out.getvalue()
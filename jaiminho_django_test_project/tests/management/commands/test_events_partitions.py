@@ -0,0 +1,48 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+pytestmark = pytest.mark.django_db
+
+
+class TestEventsPartitionsCommand:
+    def test_requires_postgresql(self):
+        with pytest.raises(CommandError, match="only supported on PostgreSQL"):
+            call_command("events_partitions", setup=True)
+
+    def test_setup_when_table_is_not_partitioned(self, mocker):
+        mocker.patch(
+            "jaiminho.management.commands.events_partitions.is_partitioned",
+            return_value=False,
+        )
+        setup_partitioning = mocker.patch(
+            "jaiminho.management.commands.events_partitions.setup_partitioning",
+            return_value=["jaiminho_event_p20261017_20261018"],
+        )
+
+        call_command("events_partitions", setup=True, interval="weekly", premake=2)
+
+        setup_partitioning.assert_called_once_with("weekly", 2)
+
+    def test_requires_setup_flag_when_table_is_not_partitioned(self, mocker):
+        mocker.patch(
+            "jaiminho.management.commands.events_partitions.is_partitioned",
+            return_value=False,
+        )
+
+        with pytest.raises(CommandError, match="run with --setup"):
+            call_command("events_partitions")
+
+    def test_creates_upcoming_partitions(self, mocker):
+        mocker.patch(
+            "jaiminho.management.commands.events_partitions.is_partitioned",
+            return_value=True,
+        )
+        mocker.patch("jaiminho.settings.partition_interval", "weekly")
+        create_partitions = mocker.patch(
+            "jaiminho.management.commands.events_partitions.create_partitions",
+            return_value=[],
+        )
+
+        call_command("events_partitions")
+
+        create_partitions.assert_called_once_with("weekly", 7)
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+import pytest
+from dateutil.tz import UTC
+from django.core.management import CommandError, call_command
+
+from jaiminho.models import Event
+from jaiminho.tests.factories import EventFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestEventsRequeueCommand:
+    def create_dead_event(self, dead_at, **kwargs):
+        return EventFactory(
+            attempts=5,
+            last_error="Exception: Broker is down",
+            dead_at=dead_at,
+            **kwargs
+        )
+
+    def test_requeues_dead_events(self):
+        dead_event = self.create_dead_event(datetime(2022, 10, 31, tzinfo=UTC))
+        pending_event = EventFactory(attempts=1)
+
+        call_command("events_requeue")
+
+        dead_event.refresh_from_db()
+        assert dead_event.dead_at is None
+        assert dead_event.attempts == 0
+        assert dead_event.next_attempt_at is None
+        assert dead_event.last_error == "Exception: Broker is down"
+        pending_event.refresh_from_db()
+        assert pending_event.attempts == 1
+
+    def test_requeues_dead_events_of_stream(self):
+        stream_event = self.create_dead_event(
+            datetime(2022, 10, 31, tzinfo=UTC), stream="my-stream"
+        )
+        other_stream_event = self.create_dead_event(
+            datetime(2022, 10, 31, tzinfo=UTC), stream="other-stream"
+        )
+
+        call_command("events_requeue", stream="my-stream")
+
+        assert list(Event.objects.filter(dead_at__isnull=False)) == [other_stream_event]
+        stream_event.refresh_from_db()
+        assert stream_event.dead_at is None
+
+    def test_requeues_dead_events_of_time_range(self):
+        self.create_dead_event(datetime(2022, 10, 30, tzinfo=UTC))
+        requeued_event = self.create_dead_event(datetime(2022, 10, 31, tzinfo=UTC))
+        self.create_dead_event(datetime(2022, 11, 1, tzinfo=UTC))
+
+        call_command(
+            "events_requeue",
+            "--dead-after=2022-10-31T00:00:00",
+            "--dead-before=2022-11-01T00:00:00+00:00",
+        )
+
+        assert list(Event.objects.filter(dead_at__isnull=True)) == [requeued_event]
+
+    def test_rejects_invalid_datetime(self):
+        with pytest.raises(CommandError, match="Invalid datetime"):
+            call_command("events_requeue", "--dead-after=yesterday")
@@ -1,10 +1,11 @@
 from datetime import timedelta
 
 import pytest
-from django.core.management import call_command
+from django.core.management import CommandError, call_command
 from django.utils import timezone
+from freezegun import freeze_time
 
-from jaiminho.models import Event
+from jaiminho.models import Event, EventArchive
 from jaiminho.tests.factories import EventFactory
 from jaiminho_django_test_project.management.commands import validate_event_cleaner
 
@@ -83,3 +84,163 @@ class TestEventCleanerCommand:
         remaining_events = Event.objects.all()
         assert set(remaining_events) == {*older_events, *newer_events, *not_sent_events}
         assert len(Event.objects.all()) == 6
+
+    def test_command_deletes_older_archived_events(self, mocker, caplog):
+        mocker.patch("jaiminho.settings.time_to_delete", self.TIME_TO_DELETE)
+        older_event, newer_event = EventFactory.create_batch(2)
+        Event.objects.filter(id=older_event.id).archive()
+        Event.objects.filter(id=newer_event.id).archive()
+        EventArchive.objects.filter(id=older_event.id).update(
+            sent_at=timezone.now() - self.TIME_TO_DELETE - timedelta(days=1)
+        )
+
+        call_command(validate_event_cleaner.Command())
+
+        assert list(EventArchive.objects.values_list("id", flat=True)) == [
+            newer_event.id
+        ]
+        assert (
+            "JAIMINHO-EVENT-CLEANER: Successfully deleted 1 archived events"
+            in caplog.text
+        )
+
+
+class TestEventCleanerCommandInChunks:
+    TIME_TO_DELETE = timedelta(days=5)
+
+    @pytest.fixture(autouse=True)
+    def time_to_delete(self, mocker):
+        mocker.patch("jaiminho.settings.time_to_delete", self.TIME_TO_DELETE)
+
+    @pytest.fixture
+    def mock_sleep(self, mocker):
+        return mocker.patch("jaiminho.management.commands.event_cleaner.sleep")
+
+    @pytest.fixture
+    def older_events(self):
+        return EventFactory.create_batch(
+            5, sent_at=timezone.now() - self.TIME_TO_DELETE - timedelta(days=1)
+        )
+
+    @pytest.fixture
+    def newer_events(self):
+        return EventFactory.create_batch(
+            2, sent_at=timezone.now() - self.TIME_TO_DELETE + timedelta(days=1)
+        )
+
+    @pytest.fixture
+    def not_sent_events(self):
+        return EventFactory.create_batch(2, sent_at=None)
+
+    def test_deletes_older_events_in_chunks(
+        self, older_events, newer_events, not_sent_events, mock_sleep, caplog
+    ):
+        call_command(validate_event_cleaner.Command(), chunk_size=2)
+
+        assert set(Event.objects.all()) == {*newer_events, *not_sent_events}
+        assert (
+            "JAIMINHO-EVENT-CLEANER: Deleted chunk of 2 events (2 deleted so far)"
+            in caplog.text
+        )
+        assert (
+            "JAIMINHO-EVENT-CLEANER: Deleted chunk of 2 events (4 deleted so far)"
+            in caplog.text
+        )
+        assert (
+            "JAIMINHO-EVENT-CLEANER: Deleted chunk of 1 events (5 deleted so far)"
+            in caplog.text
+        )
+        assert "JAIMINHO-EVENT-CLEANER: Successfully deleted 5 events" in caplog.text
+        mock_sleep.assert_not_called()
+
+    def test_deletes_chunks_in_primary_key_order(self, mocker, mock_sleep):
+        older_first = timezone.now() - self.TIME_TO_DELETE - timedelta(days=1)
+        events = [
+            EventFactory(sent_at=older_first + timedelta(minutes=minutes))
+            for minutes in (3, 2, 1)
+        ]
+        mocker.patch(
+            "jaiminho.management.commands.event_cleaner.monotonic",
+            side_effect=[0, 0, 1, 1],
+        )
+
+        call_command(validate_event_cleaner.Command(), chunk_size=2, max_runtime=0.5)
+
+        assert list(Event.objects.all()) == events[2:]
+
+    def test_sleeps_between_chunks(self, older_events, mock_sleep):
+        call_command(
+            validate_event_cleaner.Command(), chunk_size=2, sleep_between_chunks=0.1
+        )
+
+        assert Event.objects.count() == 0
+        assert mock_sleep.call_count == 2
+        mock_sleep.assert_called_with(0.1)
+
+    def test_stops_when_max_runtime_is_reached(
+        self, mocker, older_events, mock_sleep, caplog
+    ):
+        mocker.patch(
+            "jaiminho.management.commands.event_cleaner.monotonic",
+            side_effect=[0, 0, 1, 1],
+        )
+
+        call_command(validate_event_cleaner.Command(), chunk_size=2, max_runtime=0.5)
+
+        assert list(Event.objects.order_by("id")) == older_events[2:]
+        assert "JAIMINHO-EVENT-CLEANER: Max runtime of 0.5s reached" in caplog.text
+        assert "JAIMINHO-EVENT-CLEANER: Successfully deleted 2 events" in caplog.text
+
+    def test_doesnt_delete_when_there_are_no_older_events(
+        self, newer_events, not_sent_events, mock_sleep
+    ):
+        call_command(validate_event_cleaner.Command(), chunk_size=2)
+
+        assert Event.objects.count() == 4
+
+
+class TestEventCleanerCommandDroppingPartitions:
+    TIME_TO_DELETE = timedelta(days=5)
+
+    @pytest.fixture(autouse=True)
+    def time_to_delete(self, mocker):
+        mocker.patch("jaiminho.settings.time_to_delete", self.TIME_TO_DELETE)
+
+    def test_requires_postgresql(self):
+        with pytest.raises(CommandError, match="only supported on PostgreSQL"):
+            call_command(validate_event_cleaner.Command(), drop_partitions=True)
+
+    @freeze_time("2026-10-17")
+    def test_drops_expired_partitions_and_deletes_remaining_events(
+        self, mocker, caplog
+    ):
+        older_event = EventFactory(
+            sent_at=timezone.now() - self.TIME_TO_DELETE - timedelta(days=1)
+        )
+        mocker.patch(
+            "jaiminho.management.commands.event_cleaner.is_partitioned",
+            return_value=True,
+        )
+        drop_expired_partitions = mocker.patch(
+            "jaiminho.management.commands.event_cleaner.drop_expired_partitions",
+            return_value=["jaiminho_event_p20261001_20261002"],
+        )
+
+        call_command(validate_event_cleaner.Command(), drop_partitions=True)
+
+        drop_expired_partitions.assert_called_once_with(
+            timezone.now() - self.TIME_TO_DELETE
+        )
+        assert not Event.objects.filter(id=older_event.id).exists()
+        assert (
+            "JAIMINHO-EVENT-CLEANER: Successfully dropped 1 partitions" in caplog.text
+        )
+
+    def test_requires_partitioned_table(self, mocker):
+        mocker.patch(
+            "jaiminho.management.commands.event_cleaner.is_partitioned",
+            return_value=False,
+        )
+
+        with pytest.raises(CommandError, match="events_partitions --setup"):
+            call_command(validate_event_cleaner.Command(), drop_partitions=True)
@@ -1,17 +1,27 @@
-from datetime import datetime
+import asyncio
+import threading
+from datetime import datetime, timedelta
 from unittest import mock
 from unittest.mock import call
 
 import dill
 import pytest
+from asgiref.sync import async_to_sync
 from dateutil.tz import UTC
-from django.core.management import call_command
+from django.core.management import CommandError, call_command
 from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
 from freezegun import freeze_time
 
+from jaiminho.async_relayer import AsyncEventRelayer
+from jaiminho.compression import compress
 from jaiminho.constants import PublishStrategyType
-from jaiminho.signals import get_event_payload
-from jaiminho.models import Event
+from jaiminho.signals import events_relay_iteration_finished, get_event_payload
+from jaiminho.models import Event, EventArchive
+from jaiminho.management.commands.events_relay import (
+    next_loop_interval,
+    parse_streams,
+)
 from jaiminho.relayer import EventRelayer
 from jaiminho.tests.factories import EventFactory
 from jaiminho_django_test_project.management.commands import validate_events_relay
@@ -19,12 +29,27 @@ from jaiminho_django_test_project.send import (
     notify,
     notify_without_decorator,
     notify_to_stream,
+    notify_to_stream_ordered_by_key,
+    notify_async,
     ExampleClass,
 )
 
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture
+def mock_internal_notify(mocker):
+    return mocker.patch(
+        "jaiminho_django_test_project.send.internal_notify", autospec=True
+    )
+
+
+def create_event(function=notify, **kwargs):
+    return EventFactory(
+        function=dill.dumps(function), message=dill.dumps(({"b": 1},)), **kwargs
+    )
+
+
 class TestValidateEventsRelay:
     @pytest.fixture
     def mock_log_metric(self, mocker):
@@ -50,12 +75,6 @@ class TestValidateEventsRelay:
             "jaiminho.publish_strategies.event_failed_to_publish.send", autospec=True
         )
 
-    @pytest.fixture
-    def mock_internal_notify(self, mocker):
-        return mocker.patch(
-            "jaiminho_django_test_project.send.internal_notify", autospec=True
-        )
-
     @pytest.fixture
     def mock_internal_notify_fail(self, mocker):
         mock = mocker.patch(
@@ -268,6 +287,82 @@ class TestValidateEventsRelay:
 
         assert event_relayer_mock.relay.call_count == 3
 
+    def test_relay_loop_waits_for_notifications_when_listening(
+        self,
+        mock_log_metric,
+        mocker,
+    ):
+        listener_class_mock = mocker.patch(
+            "jaiminho.management.commands.events_relay.EventNotificationListener"
+        )
+        sleep_mock = mocker.patch("jaiminho.management.commands.events_relay.sleep")
+        event_relayer_mock = mocker.MagicMock(spec=EventRelayer)
+        event_relayer_mock.relay.side_effect = [None, None, Exception()]
+
+        with pytest.raises(Exception):
+            command = validate_events_relay.Command()
+            command.event_relayer = event_relayer_mock
+            call_command(
+                command, run_in_loop=True, loop_interval=5, listen=True, stream="s1"
+            )
+
+        assert event_relayer_mock.relay.call_count == 3
+        assert listener_class_mock.return_value.wait.call_args_list == [
+            call(5, stream="s1"),
+            call(5, stream="s1"),
+        ]
+        sleep_mock.assert_not_called()
+
+    def test_relay_loop_can_only_listen_on_postgresql(self, mock_log_metric, mocker):
+        event_relayer_mock = mocker.MagicMock(spec=EventRelayer)
+
+        with pytest.raises(CommandError, match="only supported on PostgreSQL"):
+            command = validate_events_relay.Command()
+            command.event_relayer = event_relayer_mock
+            call_command(command, run_in_loop=True, listen=True)
+
+        event_relayer_mock.relay.assert_not_called()
+
+    def test_relay_loop_adapts_interval_to_relayed_events(
+        self,
+        mock_log_metric,
+        mocker,
+    ):
+        sleep_mock = mocker.patch("jaiminho.management.commands.events_relay.sleep")
+        iteration_finished_receiver = mocker.Mock()
+        events_relay_iteration_finished.connect(iteration_finished_receiver)
+        event_relayer_mock = mocker.MagicMock(spec=EventRelayer)
+        event_relayer_mock.relay.side_effect = [10, 10, 3, 0, 0, 0, 0, 2, Exception()]
+
+        with pytest.raises(Exception):
+            command = validate_events_relay.Command()
+            command.event_relayer = event_relayer_mock
+            call_command(
+                command,
+                run_in_loop=True,
+                loop_interval=0.5,
+                max_loop_interval=3,
+                max_events=10,
+            )
+        events_relay_iteration_finished.disconnect(iteration_finished_receiver)
+
+        assert event_relayer_mock.relay.call_count == 9
+        assert sleep_mock.call_args_list == [
+            call(0.5),
+            call(1),
+            call(2),
+            call(3),
+            call(3),
+            call(0.5),
+        ]
+        assert [
+            kwargs["loop_interval"]
+            for _, kwargs in iteration_finished_receiver.call_args_list
+        ] == [0, 0, 0.5, 1, 2, 3, 3, 0.5]
+        assert (
+            iteration_finished_receiver.call_args_list[0].kwargs["events_count"] == 10
+        )
+
     def test_does_not_run_in_loop_by_default(
         self,
         mock_log_metric,
@@ -864,3 +959,1277 @@ class TestValidateEventsRelay:
         exception_raised = mock_custom_capture_fn.call_args[0][0]
         assert exception_raised == mock_internal_notify_fail.side_effect
         assert "Some error" == str(exception_raised)
+
+    @pytest.mark.parametrize(
+        "publish_strategy",
+        (PublishStrategyType.PUBLISH_ON_COMMIT, PublishStrategyType.KEEP_ORDER),
+    )
+    def test_relay_in_batches_marks_events_as_sent_in_bulk(
+        self,
+        mock_internal_notify,
+        mock_should_not_delete_after_send,
+        publish_strategy,
+        mocker,
+    ):
+        mocker.patch("jaiminho.settings.publish_strategy", publish_strategy)
+        mark_as_sent_spy = mocker.spy(Event, "mark_as_sent")
+        events = [
+            EventFactory(function=dill.dumps(notify), message=dill.dumps(({"b": i},)))
+            for i in range(3)
+        ]
+
+        with freeze_time("2022-10-31"):
+            call_command(validate_events_relay.Command(), batch_size=2)
+
+        assert mock_internal_notify.call_count == 3
+        mark_as_sent_spy.assert_not_called()
+        for event in events:
+            event.refresh_from_db()
+            assert event.sent_at == datetime(2022, 10, 31, tzinfo=UTC)
+
+    def test_relay_in_batches_deletes_events_in_bulk(
+        self,
+        mock_internal_notify,
+        mock_should_delete_after_send,
+    ):
+        EventFactory.create_batch(
+            3, function=dill.dumps(notify), message=dill.dumps(({"b": 1},))
+        )
+
+        call_command(validate_events_relay.Command(), "--batch-size", "2")
+
+        assert mock_internal_notify.call_count == 3
+        assert Event.objects.count() == 0
+
+    def test_relay_in_batches_acknowledges_sent_events_before_getting_stuck(
+        self,
+        mock_internal_notify,
+        mock_should_not_delete_after_send,
+        mocker,
+        caplog,
+    ):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.KEEP_ORDER
+        )
+        mock_internal_notify.side_effect = [None, Exception("Some error"), None]
+        first_event, second_event, third_event = [
+            EventFactory(function=dill.dumps(notify), message=dill.dumps(({"b": i},)))
+            for i in range(3)
+        ]
+
+        call_command(validate_events_relay.Command(), batch_size=10)
+
+        assert mock_internal_notify.call_count == 2
+        first_event.refresh_from_db()
+        second_event.refresh_from_db()
+        third_event.refresh_from_db()
+        assert first_event.sent_at is not None
+        assert second_event.sent_at is None
+        assert third_event.sent_at is None
+        assert "Events relaying are stuck due to failing Event" in caplog.text
+
+    @pytest.mark.parametrize("batch_size", (1, 2, 5, 10))
+    def test_relay_in_pages_keeps_events_order(
+        self, mock_internal_notify, mock_should_not_delete_after_send, batch_size
+    ):
+        with freeze_time("2022-01-01"):
+            for i in range(5):
+                EventFactory(
+                    function=dill.dumps(notify), message=dill.dumps(({"b": i},))
+                )
+
+        call_command(validate_events_relay.Command(), batch_size=batch_size)
+
+        assert mock_internal_notify.call_args_list == [call({"b": i}) for i in range(5)]
+        assert Event.objects.filter(sent_at__isnull=True).count() == 0
+
+    def test_relay_in_pages_skips_failed_events_already_fetched(
+        self, mock_internal_notify, mock_should_not_delete_after_send, mocker
+    ):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        mock_internal_notify.side_effect = [Exception("Some error"), None, None]
+        for i in range(3):
+            EventFactory(function=dill.dumps(notify), message=dill.dumps(({"b": i},)))
+
+        call_command(validate_events_relay.Command(), batch_size=1)
+
+        assert mock_internal_notify.call_args_list == [call({"b": i}) for i in range(3)]
+        assert Event.objects.filter(sent_at__isnull=True).count() == 1
+
+    @pytest.mark.parametrize("batch_size", (None, 2))
+    def test_relay_respects_max_events(
+        self, mock_internal_notify, mock_should_not_delete_after_send, batch_size
+    ):
+        for i in range(5):
+            EventFactory(function=dill.dumps(notify), message=dill.dumps(({"b": i},)))
+
+        events_count = EventRelayer().relay(batch_size=batch_size, max_events=3)
+
+        assert events_count == 3
+        assert mock_internal_notify.call_args_list == [call({"b": i}) for i in range(3)]
+        assert Event.objects.filter(sent_at__isnull=True).count() == 2
+
+
+class TestEventsRelayWithLeases:
+    @pytest.fixture(autouse=True)
+    def publish_on_commit(self, mocker):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        mocker.patch("jaiminho.settings.delete_after_send", False)
+
+    def test_relay_claims_events_before_relaying_them(self, mock_internal_notify):
+        for i in range(3):
+            EventFactory(function=dill.dumps(notify), message=dill.dumps(({"b": i},)))
+
+        with freeze_time("2022-10-31"):
+            call_command(
+                validate_events_relay.Command(),
+                lease_duration=30,
+                worker_id="worker-1",
+                batch_size=2,
+            )
+
+        assert mock_internal_notify.call_args_list == [call({"b": i}) for i in range(3)]
+        for event in Event.objects.all():
+            assert event.sent_at == datetime(2022, 10, 31, tzinfo=UTC)
+            assert event.claimed_by == "worker-1"
+
+    def test_relay_skips_events_leased_by_another_worker(self, mock_internal_notify):
+        with freeze_time("2022-10-31"):
+            leased_event = EventFactory(
+                function=dill.dumps(notify),
+                message=dill.dumps(({"b": 1},)),
+                claimed_by="worker-2",
+                lease_expires_at=datetime(2022, 10, 31, 0, 1, tzinfo=UTC),
+            )
+            expired_lease_event = EventFactory(
+                function=dill.dumps(notify),
+                message=dill.dumps(({"b": 2},)),
+                claimed_by="worker-3",
+                lease_expires_at=datetime(2022, 10, 30, tzinfo=UTC),
+            )
+
+            EventRelayer().relay(lease_duration=30, worker_id="worker-1")
+
+        mock_internal_notify.assert_called_once_with({"b": 2})
+        leased_event.refresh_from_db()
+        expired_lease_event.refresh_from_db()
+        assert leased_event.sent_at is None
+        assert leased_event.claimed_by == "worker-2"
+        assert expired_lease_event.sent_at is not None
+        assert expired_lease_event.claimed_by == "worker-1"
+
+    def test_relay_does_not_claim_events_that_keep_order(self, mock_internal_notify):
+        ordered_event = EventFactory(
+            function=dill.dumps(notify),
+            message=dill.dumps(({"b": 1},)),
+            strategy=PublishStrategyType.KEEP_ORDER,
+        )
+
+        events_count = EventRelayer().relay(lease_duration=30)
+
+        assert events_count == 0
+        mock_internal_notify.assert_not_called()
+        ordered_event.refresh_from_db()
+        assert ordered_event.claimed_by is None
+
+    def test_failed_events_keep_their_lease(self, mock_internal_notify):
+        mock_internal_notify.side_effect = Exception("Some error")
+        event = EventFactory(
+            function=dill.dumps(notify), message=dill.dumps(({"b": 1},))
+        )
+
+        with freeze_time("2022-10-31"):
+            events_count = EventRelayer().relay(
+                lease_duration=30, worker_id="worker-1", batch_size=1
+            )
+
+        assert events_count == 0
+        mock_internal_notify.assert_called_once()
+        event.refresh_from_db()
+        assert event.sent_at is None
+        assert event.claimed_by == "worker-1"
+        assert event.lease_expires_at == datetime(2022, 10, 31, 0, 0, 30, tzinfo=UTC)
+
+    def test_relay_claims_pages_without_batch_size(self, mocker, mock_internal_notify):
+        mocker.patch("jaiminho.relayer.DEFAULT_CLAIM_BATCH_SIZE", 2)
+        claimed_counts = []
+        mock_internal_notify.side_effect = lambda payload: claimed_counts.append(
+            Event.objects.filter(claimed_by="worker-1").count()
+        )
+        for i in range(3):
+            EventFactory(function=dill.dumps(notify), message=dill.dumps(({"b": i},)))
+
+        events_count = EventRelayer().relay(lease_duration=30, worker_id="worker-1")
+
+        assert events_count == 3
+        assert claimed_counts == [2, 2, 3]
+
+    @pytest.mark.parametrize("workers", (None, 2))
+    def test_events_whose_lease_expired_are_not_relayed(
+        self, mock_internal_notify, workers
+    ):
+        first_event = EventFactory(
+            function=dill.dumps(notify), message=dill.dumps(({"b": 1},))
+        )
+        second_event = EventFactory(
+            function=dill.dumps(notify), message=dill.dumps(({"b": 2},))
+        )
+
+        with freeze_time("2022-10-31") as frozen_time:
+            mock_internal_notify.side_effect = lambda payload: frozen_time.tick(60)
+            events_count = EventRelayer().relay(
+                lease_duration=30,
+                worker_id="worker-1",
+                batch_size=2,
+                max_events=2,
+                workers=workers,
+            )
+
+        assert events_count == 1
+        mock_internal_notify.assert_called_once()
+        first_event.refresh_from_db()
+        second_event.refresh_from_db()
+        assert first_event.sent_at is not None
+        assert second_event.sent_at is None
+        assert second_event.attempts == 0
+
+
+class TestEventsRelayWithOrderingKeys:
+    @pytest.fixture(autouse=True)
+    def keep_order(self, mocker):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.KEEP_ORDER
+        )
+        mocker.patch("jaiminho.settings.delete_after_send", False)
+
+    @pytest.fixture
+    def mock_internal_notify(self, mock_internal_notify):
+        def fail_for_key_a(payload, **kwargs):
+            if payload["id"] == "a":
+                raise Exception("Some error")
+
+        mock_internal_notify.side_effect = fail_for_key_a
+        return mock_internal_notify
+
+    @pytest.fixture
+    def events(self):
+        return [
+            EventFactory(
+                function=dill.dumps(notify_to_stream_ordered_by_key),
+                message=dill.dumps(({"id": key, "n": n},)),
+                stream="my-stream",
+                strategy=PublishStrategyType.KEEP_ORDER,
+                ordering_key=key,
+            )
+            for n, key in enumerate(["a", "b", "a", "b", "c"])
+        ]
+
+    @pytest.mark.parametrize("workers", (None, 1, 3))
+    def test_failing_event_only_blocks_its_ordering_key(
+        self, mock_internal_notify, events, workers, caplog
+    ):
+        EventRelayer().relay(stream="my-stream", workers=workers, batch_size=2)
+
+        calls = mock_internal_notify.call_args_list
+        assert calls.count(call({"id": "a", "n": 0})) == 1
+        assert call({"id": "a", "n": 2}) not in calls
+        assert [c for c in calls if c.args[0]["id"] == "b"] == [
+            call({"id": "b", "n": 1}),
+            call({"id": "b", "n": 3}),
+        ]
+        assert call({"id": "c", "n": 4}) in calls
+        sent_events = Event.objects.filter(sent_at__isnull=False)
+        assert {event.message for event in sent_events} == {
+            events[1].message,
+            events[3].message,
+            events[4].message,
+        }
+        assert "Events relaying are stuck due to failing Event" in caplog.text
+
+    def test_failing_event_without_ordering_key_blocks_the_stream(
+        self, mock_internal_notify
+    ):
+        EventFactory(
+            function=dill.dumps(notify_to_stream_ordered_by_key),
+            message=dill.dumps(({"id": "a"},)),
+            stream="my-stream",
+            strategy=PublishStrategyType.KEEP_ORDER,
+        )
+        EventFactory(
+            function=dill.dumps(notify_to_stream_ordered_by_key),
+            message=dill.dumps(({"id": "b"},)),
+            stream="my-stream",
+            strategy=PublishStrategyType.KEEP_ORDER,
+        )
+
+        EventRelayer().relay(stream="my-stream")
+
+        mock_internal_notify.assert_called_once_with({"id": "a"})
+
+    @pytest.mark.parametrize("workers", (None, 2))
+    def test_failing_event_without_ordering_key_blocks_following_keys(
+        self, mock_internal_notify, workers
+    ):
+        for key in ("x", None, "c"):
+            EventFactory(
+                function=dill.dumps(notify_to_stream_ordered_by_key),
+                message=dill.dumps(({"id": key or "a"},)),
+                stream="my-stream",
+                strategy=PublishStrategyType.KEEP_ORDER,
+                ordering_key=key,
+            )
+
+        EventRelayer().relay(stream="my-stream", workers=workers)
+
+        assert mock_internal_notify.call_args_list == [
+            call({"id": "x"}),
+            call({"id": "a"}),
+        ]
+        assert [
+            dill.loads(event.message)[0]["id"]
+            for event in Event.objects.filter(sent_at__isnull=False)
+        ] == ["x"]
+
+
+class TestEventsRelayFunctionCache:
+    @pytest.fixture(autouse=True)
+    def relay_settings(self, mocker, mock_internal_notify):
+        mocker.patch("jaiminho.settings.delete_after_send", False)
+
+    def test_functions_are_unpickled_once(self, mocker):
+        for i in range(3):
+            EventFactory(function=dill.dumps(notify), message=dill.dumps(({"b": i},)))
+        EventFactory(
+            function=dill.dumps(notify_to_stream), message=dill.dumps(({"b": 3},))
+        )
+        dill_loads_spy = mocker.spy(dill, "loads")
+        event_relayer = EventRelayer()
+
+        event_relayer.relay()
+
+        function_blobs = {dill.dumps(notify), dill.dumps(notify_to_stream)}
+        unpickled_functions = [
+            c for c in dill_loads_spy.call_args_list if c.args[0] in function_blobs
+        ]
+        assert len(unpickled_functions) == 2
+        assert event_relayer.stats() == {
+            "function_cache_hits": 2,
+            "function_cache_misses": 2,
+            "function_cache_size": 2,
+            "circuit_breakers": {},
+        }
+
+    def test_function_cache_is_bounded(self, mocker):
+        mocker.patch("jaiminho.settings.function_cache_size", 1)
+        EventFactory(function=dill.dumps(notify), message=dill.dumps(({"b": 1},)))
+        EventFactory(
+            function=dill.dumps(notify_to_stream), message=dill.dumps(({"b": 2},))
+        )
+        EventFactory(function=dill.dumps(notify), message=dill.dumps(({"b": 3},)))
+        event_relayer = EventRelayer()
+
+        event_relayer.relay()
+
+        assert event_relayer.stats() == {
+            "function_cache_hits": 0,
+            "function_cache_misses": 3,
+            "function_cache_size": 1,
+            "circuit_breakers": {},
+        }
+
+
+class TestEventsRelayWithFunctionReferences:
+    @pytest.fixture(autouse=True)
+    def relay_settings(self, mocker, mock_internal_notify):
+        mocker.patch("jaiminho.settings.delete_after_send", False)
+
+    def test_relay_resolves_function_reference(self, mock_internal_notify):
+        event = EventFactory(
+            function_path="jaiminho_django_test_project.send:notify",
+            message=dill.dumps(({"b": 1},)),
+        )
+
+        EventRelayer().relay()
+
+        mock_internal_notify.assert_called_once_with({"b": 1})
+        event.refresh_from_db()
+        assert event.sent_at is not None
+
+    def test_relay_does_not_relay_tampered_function_reference(
+        self, mock_internal_notify, caplog
+    ):
+        EventFactory(
+            function_path="jaiminho_django_test_project.send:notify",
+            message=dill.dumps(({"b": 1},)),
+        )
+        Event.objects.update(
+            function_path="jaiminho_django_test_project.send:notify_to_stream"
+        )
+
+        EventRelayer().relay()
+
+        mock_internal_notify.assert_not_called()
+        assert "Event has been tampered" in caplog.text
+
+    def test_relay_when_referenced_function_does_not_exist_anymore(
+        self, mock_internal_notify, caplog
+    ):
+        EventFactory(
+            function_path="jaiminho_django_test_project.send:never_existed",
+            message=dill.dumps(({"b": 1},)),
+        )
+
+        EventRelayer().relay()
+
+        mock_internal_notify.assert_not_called()
+        assert "Function does not exist anymore" in caplog.text
+
+
+class TestEventsRelayWithSerializers:
+    @pytest.fixture(autouse=True)
+    def relay_settings(self, mocker, mock_internal_notify):
+        mocker.patch("jaiminho.settings.delete_after_send", False)
+
+    def test_relay_event_serialized_as_json(self, mock_internal_notify):
+        event = EventFactory(
+            function=dill.dumps(notify),
+            message=b'[{"b":1},"c"]',
+            kwargs=b'{"d":2}',
+            serializer="json",
+        )
+
+        EventRelayer().relay()
+
+        mock_internal_notify.assert_called_once_with({"b": 1}, "c", d=2)
+        event.refresh_from_db()
+        assert event.sent_at is not None
+
+    def test_relay_publishes_json_payloads_unchanged(
+        self, mocker, mock_internal_notify
+    ):
+        mocker.patch("jaiminho.settings.serializer", "json")
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.KEEP_ORDER
+        )
+        payload = {"at": datetime(2022, 1, 1), "items": (1, 2)}
+        notify(payload)
+        mock_internal_notify.assert_not_called()
+
+        EventRelayer().relay()
+
+        mock_internal_notify.assert_called_once_with(payload)
+
+    def test_relay_event_without_serializer_uses_dill(self, mock_internal_notify):
+        EventFactory(
+            function=dill.dumps(notify),
+            message=dill.dumps(({"b": 1},)),
+            serializer=None,
+        )
+
+        EventRelayer().relay()
+
+        mock_internal_notify.assert_called_once_with({"b": 1})
+
+    def test_relay_compressed_event(self, mock_internal_notify):
+        payload = {"document": "compressible " * 200}
+        EventFactory(
+            function=dill.dumps(notify),
+            message=compress(dill.dumps((payload,)), "zlib"),
+            kwargs=compress(dill.dumps({"extra": payload}), "zlib"),
+        )
+
+        EventRelayer().relay()
+
+        mock_internal_notify.assert_called_once_with(payload, extra=payload)
+
+
+class TestEventsRelayArchivingSentEvents:
+    @pytest.fixture(autouse=True)
+    def archive_sent_events(self, mocker):
+        mocker.patch("jaiminho.settings.archive_sent_events", True)
+        mocker.patch("jaiminho.settings.delete_after_send", False)
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+
+    @pytest.mark.parametrize("batch_size", (None, 2))
+    def test_relay_moves_sent_events_to_archive(self, mock_internal_notify, batch_size):
+        mock_internal_notify.side_effect = [None, Exception("Some error"), None]
+        events = [
+            EventFactory(function=dill.dumps(notify), message=dill.dumps(({"b": i},)))
+            for i in range(3)
+        ]
+
+        with freeze_time("2022-10-31"):
+            call_command(validate_events_relay.Command(), batch_size=batch_size)
+
+        assert list(Event.objects.all()) == [events[1]]
+        archived_events = EventArchive.objects.order_by("id")
+        assert [event.id for event in archived_events] == [events[0].id, events[2].id]
+        for archived_event in archived_events:
+            assert archived_event.sent_at == datetime(2022, 10, 31, tzinfo=UTC)
+
+
+class TestEventsRelayWithMultipleStreams:
+    @pytest.fixture(autouse=True)
+    def publish_on_commit(self, mocker):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        mocker.patch("jaiminho.settings.delete_after_send", False)
+
+    def create_events(self, stream, count):
+        return [
+            EventFactory(
+                function=dill.dumps(notify),
+                message=dill.dumps(({"stream": stream, "b": i},)),
+                stream=stream,
+            )
+            for i in range(count)
+        ]
+
+    def test_relay_all_streams(self, mock_internal_notify):
+        for stream in ("s1", "s2", None):
+            self.create_events(stream, 2)
+
+        events_count = EventRelayer().relay_streams()
+
+        assert events_count == 6
+        assert Event.objects.filter(sent_at__isnull=True).count() == 0
+
+    def test_relay_only_given_streams(self, mock_internal_notify):
+        for stream in ("s1", "s2", "s3"):
+            self.create_events(stream, 2)
+
+        EventRelayer().relay_streams(streams=["s1", "s3"])
+
+        assert list(
+            Event.objects.filter(sent_at__isnull=True).values_list("stream", flat=True)
+        ) == ["s2", "s2"]
+
+    def test_relay_weighted_streams(self, mock_internal_notify):
+        for stream in ("s1", "s2"):
+            self.create_events(stream, 5)
+
+        events_count = EventRelayer().relay_streams(
+            streams={"s1": 3, "s2": 1}, max_events=1
+        )
+
+        assert events_count == 4
+        assert Event.objects.filter(stream="s1", sent_at__isnull=False).count() == 3
+        assert Event.objects.filter(stream="s2", sent_at__isnull=False).count() == 1
+
+    def test_relay_rotates_first_stream(self, mock_internal_notify):
+        for stream in ("s1", "s2"):
+            self.create_events(stream, 2)
+        event_relayer = EventRelayer()
+
+        event_relayer.relay_streams(streams=["s1", "s2"], max_events=1)
+        event_relayer.relay_streams(streams=["s1", "s2"], max_events=1)
+
+        assert [
+            call_args.args[0]["stream"]
+            for call_args in mock_internal_notify.call_args_list
+        ] == ["s1", "s2", "s2", "s1"]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_relay_streams_concurrently(self, mock_internal_notify):
+        for stream in ("s1", "s2", "s3"):
+            self.create_events(stream, 2)
+
+        events_count = EventRelayer().relay_streams(stream_workers=3)
+
+        assert events_count == 6
+        assert Event.objects.filter(sent_at__isnull=True).count() == 0
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        (
+            ("s1", {"s1": 1}),
+            ("s1:3, s2", {"s1": 3, "s2": 1}),
+            ("ns:stream:2,ns:other", {"ns:stream": 2, "ns:other": 1}),
+        ),
+    )
+    def test_parse_streams(self, value, expected):
+        assert parse_streams(value) == expected
+
+    def test_command_relays_streams(self, mocker):
+        event_relayer_mock = mocker.MagicMock(spec=EventRelayer)
+        command = validate_events_relay.Command()
+        command.event_relayer = event_relayer_mock
+
+        call_command(
+            command,
+            "--streams",
+            "s1:2,s2",
+            "--stream-workers",
+            "2",
+            "--max-events",
+            "5",
+        )
+
+        event_relayer_mock.relay_streams.assert_called_once_with(
+            streams={"s1": 2, "s2": 1},
+            stream_workers=2,
+            batch_size=None,
+            max_events=5,
+            lease_duration=None,
+            worker_id=None,
+            workers=None,
+            events_per_second=None,
+            bytes_per_second=None,
+        )
+        event_relayer_mock.relay.assert_not_called()
+
+    def test_command_relays_all_streams(self, mocker):
+        event_relayer_mock = mocker.MagicMock(spec=EventRelayer)
+        command = validate_events_relay.Command()
+        command.event_relayer = event_relayer_mock
+
+        call_command(command, "--all-streams")
+
+        assert event_relayer_mock.relay_streams.call_args.kwargs["streams"] is None
+
+    def test_command_rejects_several_stream_options(self, mocker):
+        command = validate_events_relay.Command()
+        command.event_relayer = mocker.MagicMock(spec=EventRelayer)
+
+        with pytest.raises(CommandError):
+            call_command(command, "--stream", "s1", "--all-streams")
+
+
+class TestAsyncEventsRelay:
+    @pytest.fixture(autouse=True)
+    def publish_on_commit(self, mocker):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        mocker.patch("jaiminho.settings.delete_after_send", False)
+
+    def test_relay_coroutine_and_sync_publishers(self, mock_internal_notify):
+        EventFactory(function=dill.dumps(notify_async), message=dill.dumps(({"b": 1},)))
+        EventFactory(function=dill.dumps(notify), message=dill.dumps(({"b": 2},)))
+
+        with freeze_time("2022-10-31"):
+            events_count = async_to_sync(AsyncEventRelayer().relay)()
+
+        assert events_count == 2
+        assert sorted(
+            call_args.args[0]["b"] for call_args in mock_internal_notify.call_args_list
+        ) == [1, 2]
+        assert (
+            list(Event.objects.values_list("sent_at", flat=True))
+            == [datetime(2022, 10, 31, tzinfo=UTC)] * 2
+        )
+
+    def test_relay_claims_events(self, mock_internal_notify):
+        event = EventFactory(
+            function=dill.dumps(notify_async), message=dill.dumps(({"b": 1},))
+        )
+
+        with freeze_time("2022-10-31"):
+            async_to_sync(AsyncEventRelayer().relay)(
+                worker_id="worker-1", lease_duration=30
+            )
+
+        event.refresh_from_db()
+        assert event.claimed_by == "worker-1"
+        assert event.lease_expires_at == datetime(2022, 10, 31, 0, 0, 30, tzinfo=UTC)
+
+    def test_relay_keeps_failed_events_leased(self, mock_internal_notify):
+        mock_internal_notify.side_effect = [Exception("Some error")]
+        event = EventFactory(
+            function=dill.dumps(notify_async), message=dill.dumps(({"b": 1},))
+        )
+        event_relayer = AsyncEventRelayer()
+
+        assert async_to_sync(event_relayer.relay)() == 0
+        assert async_to_sync(event_relayer.relay)() == 0
+
+        mock_internal_notify.assert_called_once()
+        event.refresh_from_db()
+        assert event.sent_at is None
+        assert event.lease_expires_at is not None
+
+    def test_relay_skips_events_whose_lease_expired(self, mock_internal_notify):
+        for i in range(2):
+            EventFactory(
+                function=dill.dumps(notify_async), message=dill.dumps(({"b": i},))
+            )
+
+        with freeze_time("2022-10-31") as frozen_time:
+            mock_internal_notify.side_effect = lambda payload: frozen_time.tick(60)
+            events_count = async_to_sync(AsyncEventRelayer().relay)(
+                lease_duration=30, batch_size=2, max_events=2, max_in_flight=1
+            )
+
+        assert events_count == 1
+        mock_internal_notify.assert_called_once()
+        assert Event.objects.filter(sent_at__isnull=True, attempts=0).count() == 1
+
+    def test_relay_skips_events_claimed_by_other_relays(self, mock_internal_notify):
+        EventFactory(
+            function=dill.dumps(notify_async),
+            message=dill.dumps(({"b": 1},)),
+            claimed_by="worker-2",
+            lease_expires_at=timezone.now() + timedelta(minutes=1),
+        )
+
+        assert async_to_sync(AsyncEventRelayer().relay)() == 0
+        mock_internal_notify.assert_not_called()
+
+    def test_relay_does_not_relay_ordered_events(self, mock_internal_notify):
+        EventFactory(
+            function=dill.dumps(notify_async),
+            message=dill.dumps(({"b": 1},)),
+            strategy=PublishStrategyType.KEEP_ORDER,
+        )
+
+        assert async_to_sync(AsyncEventRelayer().relay)() == 0
+
+    def test_relay_limits_events_in_flight(self, mocker):
+        in_flight = []
+        max_in_flight = []
+
+        async def publisher(*args, **kwargs):
+            in_flight.append(1)
+            max_in_flight.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+
+        mocker.patch.object(
+            AsyncEventRelayer, "_extract_original_func", return_value=publisher
+        )
+        for i in range(6):
+            EventFactory(function=dill.dumps(notify), message=dill.dumps(({"b": i},)))
+
+        events_count = async_to_sync(AsyncEventRelayer(max_in_flight=2).relay)(
+            batch_size=6, max_events=5
+        )
+
+        assert events_count == 5
+        assert max(max_in_flight) == 2
+        assert Event.objects.filter(sent_at__isnull=True).count() == 1
+
+    def test_command_relays_with_async_engine(self, mock_internal_notify):
+        EventFactory(function=dill.dumps(notify_async), message=dill.dumps(({"b": 1},)))
+
+        call_command(validate_events_relay.Command(), engine="async", max_in_flight=10)
+
+        mock_internal_notify.assert_called_once_with({"b": 1})
+        assert Event.objects.get().sent_at is not None
+
+
+class TestEventsRelayUnorderedEventsWithWorkers:
+    @pytest.fixture(autouse=True)
+    def publish_on_commit(self, mocker):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        mocker.patch("jaiminho.settings.delete_after_send", False)
+
+    def create_events(self, count, **kwargs):
+        return [
+            EventFactory(
+                function=dill.dumps(notify),
+                message=dill.dumps(({"b": i},)),
+                **kwargs,
+            )
+            for i in range(count)
+        ]
+
+    def test_relay_publishes_unordered_events_concurrently(self, mocker):
+        barrier = threading.Barrier(3, timeout=5)
+        mocker.patch.object(
+            EventRelayer,
+            "_extract_original_func",
+            return_value=lambda *args, **kwargs: barrier.wait(),
+        )
+        self.create_events(3)
+
+        events_count = EventRelayer().relay(workers=3)
+
+        assert events_count == 3
+        assert Event.objects.filter(sent_at__isnull=True).count() == 0
+
+    @pytest.mark.parametrize("batch_size,expected_sizes", ((2, [2, 2, 1]), (None, [5])))
+    def test_relay_acknowledges_unordered_events_in_batches(
+        self, mocker, batch_size, expected_sizes
+    ):
+        mocker.patch("jaiminho_django_test_project.send.internal_notify")
+        acknowledge_events = mocker.spy(EventRelayer, "_acknowledge_events")
+        self.create_events(5)
+
+        EventRelayer().relay(workers=2, batch_size=batch_size)
+
+        assert sorted(
+            len(call_args.args[1]) for call_args in acknowledge_events.call_args_list
+        ) == sorted(expected_sizes)
+        assert Event.objects.filter(sent_at__isnull=True).count() == 0
+
+    def test_relay_keeps_failed_unordered_events(self, mocker):
+        def internal_notify(payload):
+            if payload["b"] == 1:
+                raise Exception("Some error")
+
+        mocker.patch(
+            "jaiminho_django_test_project.send.internal_notify",
+            side_effect=internal_notify,
+        )
+        events = self.create_events(3)
+
+        EventRelayer().relay(workers=2)
+
+        assert list(Event.objects.filter(sent_at__isnull=True)) == [events[1]]
+
+    def test_relay_closes_the_connections_of_worker_threads(self, mocker):
+        mocker.patch("jaiminho_django_test_project.send.internal_notify")
+        closing_threads = []
+        mocker.patch("jaiminho.relayer.connection").close.side_effect = (
+            lambda: closing_threads.append(threading.current_thread())
+        )
+        self.create_events(3)
+
+        EventRelayer().relay(workers=2)
+
+        assert len(closing_threads) == 3
+        assert threading.current_thread() not in closing_threads
+
+    def test_relay_keeps_keep_order_events_serial(self, mocker):
+        mock_internal_notify = mocker.patch(
+            "jaiminho_django_test_project.send.internal_notify"
+        )
+        mock_internal_notify.side_effect = [None, Exception("Some error"), None]
+        events = self.create_events(3, strategy=PublishStrategyType.KEEP_ORDER)
+
+        EventRelayer().relay(workers=3)
+
+        assert mock_internal_notify.call_count == 2
+        assert (
+            list(Event.objects.filter(sent_at__isnull=True).order_by("id"))
+            == events[1:]
+        )
+
+
+class TestEventsRelayRetries:
+    @pytest.fixture(autouse=True)
+    def relay_settings(self, mocker):
+        mocker.patch("jaiminho.settings.delete_after_send", False)
+        mocker.patch("jaiminho.retries.random.uniform", return_value=1)
+
+    @pytest.mark.parametrize("workers", (None, 2))
+    def test_relay_records_failed_attempts(self, mocker, mock_internal_notify, workers):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        mock_internal_notify.side_effect = Exception("Broker is down")
+        event = create_event(attempts=2)
+
+        with freeze_time("2022-10-31"):
+            EventRelayer().relay(workers=workers)
+
+        event.refresh_from_db()
+        assert event.attempts == 3
+        assert event.last_error == "Exception: Broker is down"
+        assert event.next_attempt_at == datetime(2022, 10, 31, 0, 0, 4, tzinfo=UTC)
+        assert event.sent_at is None
+
+    def test_relay_skips_events_before_next_attempt(self, mocker, mock_internal_notify):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        with freeze_time("2022-10-31"):
+            waiting_event = create_event(
+                next_attempt_at=timezone.now() + timedelta(seconds=10)
+            )
+            due_event = create_event(next_attempt_at=timezone.now())
+
+            assert EventRelayer().relay() == 1
+
+        waiting_event.refresh_from_db()
+        due_event.refresh_from_db()
+        assert waiting_event.sent_at is None
+        assert due_event.sent_at is not None
+
+        with freeze_time("2022-10-31 00:00:10"):
+            assert EventRelayer().relay() == 1
+
+        waiting_event.refresh_from_db()
+        assert waiting_event.sent_at is not None
+
+    def test_keep_order_event_waiting_retry_holds_back_following_events(
+        self, mocker, mock_internal_notify, caplog
+    ):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.KEEP_ORDER
+        )
+        with freeze_time("2022-10-31"):
+            create_event(next_attempt_at=timezone.now() + timedelta(seconds=10))
+            create_event()
+
+            EventRelayer().relay()
+
+        mock_internal_notify.assert_not_called()
+        assert "Events relaying are waiting for the retry of Event" in caplog.text
+
+    def test_ordering_key_waiting_retry_holds_back_only_its_key(
+        self, mocker, mock_internal_notify
+    ):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.KEEP_ORDER
+        )
+        with freeze_time("2022-10-31"):
+            create_event(
+                ordering_key="a", next_attempt_at=timezone.now() + timedelta(seconds=10)
+            )
+            create_event(ordering_key="a")
+            other_key_event = create_event(ordering_key="b")
+
+            EventRelayer().relay(workers=2)
+
+        assert list(Event.objects.filter(sent_at__isnull=False)) == [other_key_event]
+
+    def test_async_relay_records_failed_attempts(self, mocker, mock_internal_notify):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        mock_internal_notify.side_effect = Exception("Broker is down")
+        event = create_event()
+
+        with freeze_time("2022-10-31"):
+            async_to_sync(AsyncEventRelayer().relay)()
+
+        event.refresh_from_db()
+        assert event.attempts == 1
+        assert event.next_attempt_at == datetime(2022, 10, 31, 0, 0, 1, tzinfo=UTC)
+
+
+class TestEventsRelayDeadLetters:
+    @pytest.fixture(autouse=True)
+    def relay_settings(self, mocker):
+        mocker.patch("jaiminho.settings.delete_after_send", False)
+        mocker.patch("jaiminho.settings.max_attempts", 3)
+
+    @pytest.mark.parametrize("workers", (None, 2))
+    def test_event_dies_after_max_attempts(
+        self, mocker, mock_internal_notify, caplog, workers
+    ):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        mock_internal_notify.side_effect = Exception("Broker is down")
+        event = create_event(attempts=2)
+
+        with freeze_time("2022-10-31"):
+            EventRelayer().relay(workers=workers)
+
+        event.refresh_from_db()
+        assert event.attempts == 3
+        assert event.dead_at == datetime(2022, 10, 31, tzinfo=UTC)
+        assert event.next_attempt_at is None
+        assert "Event is dead after 3 attempts" in caplog.text
+
+    def test_event_is_retried_before_max_attempts(self, mocker, mock_internal_notify):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        mock_internal_notify.side_effect = Exception("Broker is down")
+        event = create_event(attempts=1)
+
+        EventRelayer().relay()
+
+        event.refresh_from_db()
+        assert event.attempts == 2
+        assert event.dead_at is None
+        assert event.next_attempt_at is not None
+
+    def test_keep_order_event_never_dies(self, mocker, mock_internal_notify):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.KEEP_ORDER
+        )
+        mock_internal_notify.side_effect = Exception("Broker is down")
+        event = create_event(attempts=2)
+
+        EventRelayer().relay()
+
+        event.refresh_from_db()
+        assert event.attempts == 3
+        assert event.dead_at is None
+
+    @pytest.mark.parametrize("lease_duration", (None, 60))
+    def test_relay_skips_dead_events(
+        self, mocker, mock_internal_notify, lease_duration
+    ):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        create_event(attempts=3, dead_at=timezone.now())
+
+        assert EventRelayer().relay(lease_duration=lease_duration) == 0
+        assert async_to_sync(AsyncEventRelayer().relay)() == 0
+        assert EventRelayer().pending_streams() == []
+        mock_internal_notify.assert_not_called()
+
+    def test_async_relay_kills_event_after_max_attempts(
+        self, mocker, mock_internal_notify
+    ):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        mock_internal_notify.side_effect = Exception("Broker is down")
+        event = create_event(attempts=2)
+
+        async_to_sync(AsyncEventRelayer().relay)()
+
+        event.refresh_from_db()
+        assert event.dead_at is not None
+
+
+class TestEventsRelayCircuitBreaker:
+    @pytest.fixture(autouse=True)
+    def relay_settings(self, mocker):
+        mocker.patch("jaiminho.settings.delete_after_send", False)
+        mocker.patch("jaiminho.settings.circuit_breaker_threshold", 2)
+        mocker.patch("jaiminho.settings.circuit_breaker_reset_timeout", 30)
+
+    @pytest.mark.parametrize("workers", (None, 2))
+    def test_open_circuit_skips_remaining_events_of_function(
+        self, mocker, mock_internal_notify, workers
+    ):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        mock_internal_notify.side_effect = Exception("Broker is down")
+        for _ in range(5):
+            create_event()
+        event_relayer = EventRelayer()
+
+        event_relayer.relay(workers=workers)
+
+        if workers:
+            # Concurrent workers may try another event before the circuit opens
+            assert mock_internal_notify.call_count in (2, 3)
+        else:
+            assert mock_internal_notify.call_count == 2
+        assert (
+            Event.objects.filter(attempts=1).count() == mock_internal_notify.call_count
+        )
+        assert Event.objects.filter(attempts=0).count() == (
+            5 - mock_internal_notify.call_count
+        )
+        [circuit_breaker_stats] = event_relayer.stats()["circuit_breakers"].values()
+        assert circuit_breaker_stats["state"] == "open"
+
+    def test_open_circuit_does_not_skip_other_functions(
+        self, mocker, mock_internal_notify
+    ):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        mock_internal_notify.side_effect = [
+            Exception("Broker is down"),
+            Exception("Broker is down"),
+            None,
+        ]
+        create_event()
+        create_event()
+        create_event()
+        other_function_event = create_event(function=notify_to_stream, stream=None)
+
+        EventRelayer().relay()
+
+        other_function_event.refresh_from_db()
+        assert other_function_event.sent_at is not None
+        assert mock_internal_notify.call_count == 3
+
+    def test_circuit_half_opens_after_reset_timeout(self, mocker, mock_internal_notify):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        mock_internal_notify.side_effect = Exception("Broker is down")
+        for _ in range(3):
+            create_event()
+        event_relayer = EventRelayer()
+
+        with freeze_time("2022-10-31") as frozen_time:
+            event_relayer.relay()
+            assert mock_internal_notify.call_count == 2
+
+            frozen_time.tick(timedelta(seconds=29))
+            event_relayer.relay()
+            assert mock_internal_notify.call_count == 2
+
+            frozen_time.tick(timedelta(seconds=1))
+            mock_internal_notify.side_effect = None
+            event_relayer.relay()
+
+        assert mock_internal_notify.call_count == 5
+        assert Event.objects.filter(sent_at__isnull=True).count() == 0
+        [circuit_breaker_stats] = event_relayer.stats()["circuit_breakers"].values()
+        assert circuit_breaker_stats == {"state": "closed", "failures": 0}
+
+    def test_open_circuit_holds_back_keep_order_events(
+        self, mocker, mock_internal_notify, caplog
+    ):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.KEEP_ORDER
+        )
+        mocker.patch("jaiminho.settings.circuit_breaker_threshold", 1)
+        mock_internal_notify.side_effect = Exception("Broker is down")
+        create_event(ordering_key="a")
+        other_key_event = create_event(ordering_key="b")
+
+        EventRelayer().relay()
+
+        mock_internal_notify.assert_called_once()
+        other_key_event.refresh_from_db()
+        assert other_key_event.attempts == 0
+        assert "Events relaying are waiting for the circuit of Event" in caplog.text
+
+    def test_async_relay_skips_events_while_circuit_is_open(
+        self, mocker, mock_internal_notify
+    ):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        mock_internal_notify.side_effect = Exception("Broker is down")
+        for _ in range(5):
+            create_event()
+
+        async_to_sync(AsyncEventRelayer().relay)(max_in_flight=1)
+
+        assert mock_internal_notify.call_count == 2
+        assert Event.objects.filter(attempts=0).count() == 3
+
+
+class TestEventsRelayRateLimits:
+    @pytest.fixture(autouse=True)
+    def relay_settings(self, mocker):
+        mocker.patch("jaiminho.settings.delete_after_send", False)
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+
+    @pytest.fixture
+    def mock_sleep(self, mocker):
+        return mocker.patch("jaiminho.relayer.sleep")
+
+    def test_relay_waits_for_rate_limit(self, mock_internal_notify, mock_sleep):
+        for _ in range(4):
+            create_event(stream="my-stream")
+
+        with freeze_time("2022-10-31"):
+            EventRelayer().relay(stream="my-stream", events_per_second=2)
+
+        assert mock_internal_notify.call_count == 4
+        # The bucket starts full, then refills 2 events per second
+        assert mock_sleep.call_args_list == [call(0.5), call(1.0)]
+
+    def test_relay_limits_bytes_per_second(self, mock_internal_notify, mock_sleep):
+        event = create_event()
+        event_size = len(event.message)
+        create_event()
+
+        with freeze_time("2022-10-31"):
+            EventRelayer().relay(bytes_per_second=event_size)
+
+        assert mock_sleep.call_args_list == [call(1.0)]
+
+    def test_relay_uses_rate_limits_setting(
+        self, mocker, mock_internal_notify, mock_sleep
+    ):
+        mocker.patch(
+            "jaiminho.settings.rate_limits", {"my-stream": {"events_per_second": 1}}
+        )
+        create_event(stream="my-stream")
+        create_event(stream="my-stream")
+        create_event(stream="other-stream")
+        create_event(stream="other-stream")
+        event_relayer = EventRelayer()
+
+        with freeze_time("2022-10-31"):
+            event_relayer.relay(stream="my-stream")
+            event_relayer.relay(stream="other-stream")
+
+        assert mock_internal_notify.call_count == 4
+        assert mock_sleep.call_args_list == [call(1.0)]
+
+    def test_rate_limit_is_kept_between_relay_calls(
+        self, mock_internal_notify, mock_sleep
+    ):
+        event_relayer = EventRelayer()
+
+        with freeze_time("2022-10-31"):
+            create_event()
+            event_relayer.relay(events_per_second=1)
+            create_event()
+            event_relayer.relay(events_per_second=1)
+
+        assert mock_sleep.call_args_list == [call(1.0)]
+
+    def test_async_relay_waits_for_rate_limit(self, mocker, mock_internal_notify):
+        mock_sleep = mocker.patch(
+            "jaiminho.async_relayer.asyncio.sleep", new_callable=mock.AsyncMock
+        )
+        for _ in range(2):
+            create_event()
+
+        with freeze_time("2022-10-31"):
+            async_to_sync(AsyncEventRelayer().relay)(
+                events_per_second=1, max_in_flight=1
+            )
+
+        assert mock_internal_notify.call_count == 2
+        mock_sleep.assert_awaited_once_with(1.0)
+
+    def test_command_passes_rate_limits(self, mocker):
+        event_relayer_mock = mocker.MagicMock(spec=EventRelayer)
+        command = validate_events_relay.Command()
+        command.event_relayer = event_relayer_mock
+
+        call_command(
+            command,
+            "--stream",
+            "my-stream",
+            "--events-per-second",
+            "50",
+            "--bytes-per-second",
+            "1048576",
+        )
+
+        event_relayer_mock.relay.assert_called_once_with(
+            stream="my-stream",
+            batch_size=None,
+            max_events=None,
+            lease_duration=None,
+            worker_id=None,
+            workers=None,
+            events_per_second=50,
+            bytes_per_second=1048576,
+        )
+
+
+class TestEventsRelayReturnsPublishedEvents:
+    @pytest.fixture(autouse=True)
+    def keep_order(self, mocker):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.KEEP_ORDER
+        )
+        mocker.patch("jaiminho.settings.delete_after_send", False)
+
+    def test_stuck_relay_backs_off(self, mock_internal_notify):
+        mock_internal_notify.side_effect = Exception("Broker is down")
+        for i in range(3):
+            EventFactory(function=dill.dumps(notify), message=dill.dumps(({"b": i},)))
+        event_relayer = EventRelayer()
+
+        for _ in range(3):
+            events_count = event_relayer.relay(max_events=2, batch_size=2)
+            assert events_count == 0
+            assert next_loop_interval(1, events_count, 2, 1, 8) == 2
+
+        mock_internal_notify.assert_called_once()
@@ -23,3 +23,10 @@ def test_events_can_be_edited(admin_client):
     response = admin_client.get(url)
 
     assert response.status_code == 200
+
+
+def test_archived_events_changelist_is_accessible(admin_client):
+    url = reverse("admin:jaiminho_eventarchive_changelist")
+    response = admin_client.get(url)
+
+    assert response.status_code == 200
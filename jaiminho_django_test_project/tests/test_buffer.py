@@ -0,0 +1,124 @@
+import dill
+import pytest
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+import jaiminho_django_test_project.send
+from jaiminho.buffer import outbox_buffer
+from jaiminho.constants import PublishStrategyType
+from jaiminho.models import Event
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def mock_internal_notify(mocker):
+    return mocker.patch(
+        "jaiminho_django_test_project.send.internal_notify", autospec=True
+    )
+
+
+class TestOutboxBuffer:
+    @pytest.fixture
+    def keep_order(self, mocker):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.KEEP_ORDER
+        )
+
+    def test_events_are_created_in_bulk_when_leaving_the_buffer(
+        self, keep_order, mock_internal_notify
+    ):
+        with CaptureQueriesContext(connection) as queries:
+            with outbox_buffer():
+                for i in range(3):
+                    jaiminho_django_test_project.send.notify({"b": i})
+                assert Event.objects.count() == 0
+
+        inserts = [q for q in queries.captured_queries if "INSERT" in q["sql"]]
+        assert len(inserts) == 1
+        events = list(Event.objects.order_by("created_at", "id"))
+        assert [dill.loads(event.message) for event in events] == [
+            ({"b": i},) for i in range(3)
+        ]
+        for event in events:
+            event.verify_integrity()
+        mock_internal_notify.assert_not_called()
+
+    def test_buffered_events_are_discarded_on_error(
+        self, keep_order, mock_internal_notify
+    ):
+        with pytest.raises(ValueError):
+            with outbox_buffer():
+                jaiminho_django_test_project.send.notify({"b": 1})
+                raise ValueError()
+
+        assert Event.objects.count() == 0
+
+    def test_nested_buffers_create_events_when_leaving_the_outermost_one(
+        self, keep_order, mock_internal_notify
+    ):
+        with outbox_buffer():
+            jaiminho_django_test_project.send.notify({"b": 1})
+            with outbox_buffer():
+                jaiminho_django_test_project.send.notify({"b": 2})
+            assert Event.objects.count() == 0
+
+        assert Event.objects.count() == 2
+
+    def test_publish_on_commit_events_are_marked_as_sent(
+        self, mocker, mock_internal_notify
+    ):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        mocker.patch("jaiminho.settings.persist_all_events", True)
+        mocker.patch("jaiminho.settings.delete_after_send", False)
+
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            with outbox_buffer():
+                jaiminho_django_test_project.send.notify({"b": 1})
+                jaiminho_django_test_project.send.notify({"b": 2})
+
+        assert mock_internal_notify.call_count == 2
+        assert Event.objects.filter(sent_at__isnull=False).count() == 2
+
+    def test_events_of_rolled_back_savepoints_are_discarded(
+        self, keep_order, mock_internal_notify
+    ):
+        with outbox_buffer():
+            jaiminho_django_test_project.send.notify({"b": 1})
+            try:
+                with transaction.atomic():
+                    jaiminho_django_test_project.send.notify({"b": 2})
+                    raise ValueError()
+            except ValueError:
+                pass
+            with transaction.atomic():
+                jaiminho_django_test_project.send.notify({"b": 3})
+
+        assert [dill.loads(event.message) for event in Event.objects.all()] == [
+            ({"b": 1},),
+            ({"b": 3},),
+        ]
+
+    def test_rolled_back_publish_on_commit_events_are_not_persisted(
+        self, mocker, mock_internal_notify
+    ):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+        mocker.patch("jaiminho.settings.persist_all_events", True)
+        mocker.patch("jaiminho.settings.delete_after_send", False)
+
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            with outbox_buffer():
+                try:
+                    with transaction.atomic():
+                        jaiminho_django_test_project.send.notify({"b": 1})
+                        raise ValueError()
+                except ValueError:
+                    pass
+
+        assert Event.objects.count() == 0
+        mock_internal_notify.assert_not_called()
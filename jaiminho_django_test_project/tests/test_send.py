@@ -1,15 +1,19 @@
 from datetime import datetime
+from decimal import Decimal
+from unittest import mock
 
 import dill
 import pytest
 from dateutil.tz import UTC
 from django.core.serializers.json import DjangoJSONEncoder
 from freezegun import freeze_time
+from django.db import transaction
 from django.test import TestCase
 from django.core.signing import BadSignature
 
+from jaiminho.compression import decompress
 from jaiminho.constants import PublishStrategyType
-from jaiminho.models import Event
+from jaiminho.models import Event, EventArchive
 import jaiminho_django_test_project.send
 from jaiminho.publish_strategies import KeepOrderStrategy
 
@@ -927,3 +931,343 @@ class TestNofityWithStreamOverwritingStrategy:
         )
         assert Event.objects.all().count() == 1
         assert Event.objects.get().strategy == PublishStrategyType.KEEP_ORDER
+
+
+class TestNotifyWithStreamOrderedByKey:
+    def test_send_to_stream_should_persist_ordering_key(
+        self, mock_internal_notify, mock_should_not_delete_after_send
+    ):
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            jaiminho_django_test_project.send.notify_to_stream_ordered_by_key(
+                {"id": 42}
+            )
+
+        mock_internal_notify.assert_not_called()
+        event = Event.objects.get()
+        assert event.ordering_key == "42"
+        assert event.strategy == PublishStrategyType.KEEP_ORDER
+
+    def test_send_to_stream_without_ordering_key(
+        self, mock_internal_notify, mock_should_persist_all_events
+    ):
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            jaiminho_django_test_project.send.notify_to_stream({"id": 42})
+
+        assert Event.objects.get().ordering_key is None
+
+
+class TestNotifyStoringFunctionReference:
+    @pytest.fixture(autouse=True)
+    def store_function_reference(self, mocker):
+        mocker.patch("jaiminho.settings.store_function_reference", True)
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.KEEP_ORDER
+        )
+
+    def test_send_persists_function_reference_instead_of_pickled_function(
+        self, mock_internal_notify
+    ):
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            jaiminho_django_test_project.send.notify({"a": 1})
+
+        event = Event.objects.get()
+        assert event.function is None
+        assert event.function_path == "jaiminho_django_test_project.send:notify"
+
+    def test_send_from_class_method_persists_function_reference(
+        self, mock_internal_notify
+    ):
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            jaiminho_django_test_project.send.ExampleClass().notify({"a": 1})
+
+        event = Event.objects.get()
+        assert event.function is None
+        assert (
+            event.function_path
+            == "jaiminho_django_test_project.send:ExampleClass.notify"
+        )
+
+    def test_send_falls_back_to_pickled_function_when_not_importable(self):
+        strategy = KeepOrderStrategy()
+
+        def local_function(payload):
+            pass
+
+        strategy.publish(({"a": 1},), {}, local_function)
+
+        event = Event.objects.get()
+        assert event.function_path is None
+        assert dill.loads(event.function).__name__ == "local_function"
+
+
+class TestNotifyWithSerializer:
+    @pytest.fixture(autouse=True)
+    def keep_order(self, mocker):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.KEEP_ORDER
+        )
+
+    def test_send_uses_dill_by_default(self):
+        jaiminho_django_test_project.send.notify({"a": 1}, b=2)
+
+        event = Event.objects.get()
+        assert event.serializer == "dill"
+        assert dill.loads(event.message) == ({"a": 1},)
+        assert dill.loads(event.kwargs) == {"b": 2}
+
+    def test_send_uses_configured_serializer(self, mocker):
+        mocker.patch("jaiminho.settings.serializer", "json")
+
+        jaiminho_django_test_project.send.notify({"a": 1}, b=2)
+
+        event = Event.objects.get()
+        assert event.serializer == "json"
+        assert bytes(event.message) == b'[{"a":1}]'
+        assert bytes(event.kwargs) == b'{"b":2}'
+
+    def test_send_falls_back_to_dill_when_payload_is_not_supported(
+        self, mocker, caplog
+    ):
+        mocker.patch("jaiminho.settings.serializer", "json")
+
+        jaiminho_django_test_project.send.notify({"a": 1}, encoder=Encoder)
+
+        event = Event.objects.get()
+        assert event.serializer == "dill"
+        assert dill.loads(event.kwargs) == {"encoder": Encoder}
+        assert "falling back to dill" in caplog.text
+
+    @pytest.mark.parametrize(
+        "payload",
+        (
+            {"at": datetime(2022, 1, 1)},
+            {"amount": Decimal("1.5")},
+            {"items": (1, 2)},
+        ),
+    )
+    def test_send_falls_back_to_dill_when_payload_types_are_not_preserved(
+        self, mocker, caplog, payload
+    ):
+        mocker.patch("jaiminho.settings.serializer", "json")
+
+        jaiminho_django_test_project.send.notify(payload, extra=payload)
+
+        event = Event.objects.get()
+        assert event.serializer == "dill"
+        assert dill.loads(event.message) == (payload,)
+        assert dill.loads(event.kwargs) == {"extra": payload}
+        assert "Payload types are not preserved" in caplog.text
+
+
+class TestNotifyWithCompression:
+    PAYLOAD = {"document": "compressible " * 200}
+
+    @pytest.fixture(autouse=True)
+    def keep_order(self, mocker):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.KEEP_ORDER
+        )
+        mocker.patch("jaiminho.settings.compression_threshold", 1024)
+
+    def test_send_does_not_compress_by_default(self):
+        jaiminho_django_test_project.send.notify(self.PAYLOAD)
+
+        assert dill.loads(Event.objects.get().message) == (self.PAYLOAD,)
+
+    def test_send_compresses_payload(self, mocker):
+        mocker.patch("jaiminho.settings.compression", "zlib")
+
+        jaiminho_django_test_project.send.notify(self.PAYLOAD, extra=self.PAYLOAD)
+
+        event = Event.objects.get()
+        assert bytes(event.message[:2]) == b"\x00\x01"
+        assert bytes(event.kwargs[:2]) == b"\x00\x01"
+        assert dill.loads(decompress(event.message)) == (self.PAYLOAD,)
+
+    def test_send_does_not_compress_small_payloads(self, mocker):
+        mocker.patch("jaiminho.settings.compression", "zlib")
+
+        jaiminho_django_test_project.send.notify({"a": 1})
+
+        assert dill.loads(Event.objects.get().message) == ({"a": 1},)
+
+    def test_send_uses_stream_compression(self, mocker):
+        mocker.patch("jaiminho.settings.compression", "zlib")
+        mocker.patch(
+            "jaiminho.settings.stream_compression",
+            {jaiminho_django_test_project.send.EXAMPLE_STREAM: None},
+        )
+
+        jaiminho_django_test_project.send.notify_to_stream(self.PAYLOAD)
+        jaiminho_django_test_project.send.notify(self.PAYLOAD)
+
+        stream_event = Event.objects.get(stream__isnull=False)
+        event = Event.objects.get(stream__isnull=True)
+        assert dill.loads(stream_event.message) == (self.PAYLOAD,)
+        assert bytes(event.message[:2]) == b"\x00\x01"
+
+
+class TestNotifyCoalescingOnCommitHooks:
+    @pytest.fixture(autouse=True)
+    def coalesce_on_commit_hooks(self, mocker):
+        mocker.patch("jaiminho.settings.coalesce_on_commit_hooks", True)
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+
+    def test_send_registers_a_single_on_commit_hook(
+        self,
+        mock_internal_notify,
+        mock_should_persist_all_events,
+        mock_should_not_delete_after_send,
+    ):
+        with TestCase.captureOnCommitCallbacks(execute=True) as callbacks:
+            for i in range(3):
+                jaiminho_django_test_project.send.notify({"b": i})
+
+        assert len(callbacks) == 1
+        assert mock_internal_notify.call_args_list == [
+            mock.call({"b": i}) for i in range(3)
+        ]
+        assert Event.objects.filter(sent_at__isnull=False).count() == 3
+
+    def test_send_deletes_sent_events_in_bulk(
+        self,
+        mock_internal_notify,
+        mock_should_persist_all_events,
+        mock_should_delete_after_send,
+    ):
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            for i in range(3):
+                jaiminho_django_test_project.send.notify({"b": i})
+
+        assert mock_internal_notify.call_count == 3
+        assert Event.objects.count() == 0
+
+    def test_send_creates_failed_events(
+        self, mock_internal_notify, mock_event_failed_to_publish_signal
+    ):
+        mock_internal_notify.side_effect = [None, Exception("ups"), Exception("ups")]
+
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            for i in range(3):
+                jaiminho_django_test_project.send.notify({"b": i})
+
+        events = Event.objects.order_by("id")
+        assert [dill.loads(event.message) for event in events] == [
+            ({"b": 1},),
+            ({"b": 2},),
+        ]
+        assert mock_event_failed_to_publish_signal.call_count == 2
+
+    def test_send_does_not_publish_events_from_rolled_back_savepoints(
+        self, mock_internal_notify
+    ):
+        with TestCase.captureOnCommitCallbacks(execute=True) as callbacks:
+            jaiminho_django_test_project.send.notify({"b": 1})
+            try:
+                with transaction.atomic():
+                    jaiminho_django_test_project.send.notify({"b": 2})
+                    raise ValueError()
+            except ValueError:
+                pass
+            jaiminho_django_test_project.send.notify({"b": 3})
+
+        assert len(callbacks) == 2
+        assert mock_internal_notify.call_args_list == [
+            mock.call({"b": 1}),
+            mock.call({"b": 3}),
+        ]
+
+
+class TestNotifyArchivingSentEvents:
+    @pytest.fixture(autouse=True)
+    def archive_sent_events(self, mocker):
+        mocker.patch("jaiminho.settings.archive_sent_events", True)
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+
+    def test_send_archives_sent_event(
+        self,
+        mock_internal_notify,
+        mock_should_persist_all_events,
+        mock_should_not_delete_after_send,
+    ):
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            jaiminho_django_test_project.send.notify({"b": 1})
+
+        assert Event.objects.count() == 0
+        archived_event = EventArchive.objects.get()
+        assert archived_event.sent_at is not None
+        assert dill.loads(archived_event.message) == ({"b": 1},)
+
+    def test_send_archives_sent_events_in_bulk(
+        self,
+        mocker,
+        mock_internal_notify,
+        mock_should_persist_all_events,
+        mock_should_not_delete_after_send,
+    ):
+        mocker.patch("jaiminho.settings.coalesce_on_commit_hooks", True)
+
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            for i in range(3):
+                jaiminho_django_test_project.send.notify({"b": i})
+
+        assert Event.objects.count() == 0
+        assert EventArchive.objects.count() == 3
+
+
+class TestNotifyNotifyingRelay:
+    @pytest.fixture
+    def mock_notify_event_created(self, mocker):
+        return mocker.patch("jaiminho.publish_strategies.notify_event_created")
+
+    def test_keep_order_notifies_created_event(self, mocker, mock_notify_event_created):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.KEEP_ORDER
+        )
+
+        jaiminho_django_test_project.send.notify_to_stream({"b": 1})
+
+        mock_notify_event_created.assert_called_once_with("my-stream")
+
+    @pytest.mark.parametrize("coalesce_on_commit_hooks", (False, True))
+    def test_publish_on_commit_notifies_failed_events_only(
+        self,
+        mocker,
+        mock_internal_notify,
+        mock_notify_event_created,
+        coalesce_on_commit_hooks,
+    ):
+        mocker.patch(
+            "jaiminho.settings.coalesce_on_commit_hooks", coalesce_on_commit_hooks
+        )
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            jaiminho_django_test_project.send.notify({"b": 1})
+        mock_notify_event_created.assert_not_called()
+
+        mock_internal_notify.side_effect = Exception("ups")
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            jaiminho_django_test_project.send.notify({"b": 2})
+        mock_notify_event_created.assert_called_once_with(None)
+
+
+class TestNotifyCoroutinePublisher:
+    def test_send_runs_coroutine_publisher_on_commit(
+        self, mocker, mock_internal_notify, mock_should_persist_all_events
+    ):
+        mocker.patch(
+            "jaiminho.settings.publish_strategy", PublishStrategyType.PUBLISH_ON_COMMIT
+        )
+
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            jaiminho_django_test_project.send.notify_async({"b": 1})
+
+        mock_internal_notify.assert_called_once_with({"b": 1})
+        assert Event.objects.get().sent_at is not None
@@ -39,9 +39,12 @@ setup(
         "Programming Language :: Python :: 3.11",
         "Programming Language :: Python :: 3.12",
     ],
-    packages=find_packages(exclude=["docs", "tests", "jaiminho_django_test_project"]),
+    packages=find_packages(
+        exclude=["docs", "tests", "benchmarks", "jaiminho_django_test_project"]
+    ),
     python_requires=">=3.8, <4",
     install_requires=["Django", "sentry_sdk", "dill==0.4.0"],
+    extras_require={"msgpack": ["msgpack"], "zstd": ["zstandard"]},
     project_urls={
         "Documentation": "https://github.com/loadsmart/django-jaiminho/blob/master/README.md",
         "Source": "https://github.com/loadsmart/django-jaiminho",